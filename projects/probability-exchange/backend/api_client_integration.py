@@ -10,22 +10,35 @@ interface for fetching market data.
 
 import asyncio
 import aiohttp
+import heapq
+import orjson
 import time
 import logging
 import json
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any, Union
-from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Any, Sequence, Tuple, Union
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from urllib.parse import urljoin
+from operator import attrgetter
+from functools import lru_cache
+from urllib.parse import urlencode, urljoin
 import hashlib
 import hmac
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Handlers are configured by the application entrypoint, or below when run as a script
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Manifold outcome labels by outcomeType; tuples are shared across all markets
+_OUTCOMES_MAP = {
+    'BINARY': ('Yes', 'No'),
+    'FREE_RESPONSE': ('Free Response',),  # Not directly supported in MarketData
+    'MULTIPLE_CHOICE': ('Multiple Choice',),  # Not directly supported in MarketData
+}
+_DEFAULT_OUTCOMES = ('Yes', 'No')  # Default for unknown types
+
+_by_volume_24h = attrgetter('volume_24h')
+
+@dataclass(slots=True)
 class APIConfig:
     """Configuration for API clients"""
     api_key: str = ""
@@ -36,7 +49,7 @@ class APIConfig:
     retry_attempts: int = 3
     retry_delay: float = 1.0
 
-@dataclass
+@dataclass(slots=True)
 class MarketData:
     """Unified market data structure"""
     id: str
@@ -45,7 +58,7 @@ class MarketData:
     description: Optional[str] = None
     category: Optional[str] = None
     market_type: str = "binary"  # binary, multi_choice, scalar
-    outcomes: Optional[List[str]] = None
+    outcomes: Optional[Sequence[str]] = None
     current_price: Optional[float] = None
     probability: Optional[float] = None
     volume_24h: float = 0.0
@@ -57,6 +70,90 @@ class MarketData:
     status: str = "open"
     url: Optional[str] = None
     last_updated: datetime = None
+    # Lower-cased question words, filled lazily by the aggregator's similarity matching
+    _token_set: Optional[FrozenSet[str]] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def question_tokens(self) -> FrozenSet[str]:
+        """Lower-cased question words, computed once per market"""
+        if self._token_set is None:
+            self._token_set = frozenset(self.question.lower().split())
+        return self._token_set
+
+    @classmethod
+    def from_manifold(cls, data: Dict[str, Any], now: datetime) -> "MarketData":
+        """Build from a Manifold market-list item, skipping the generated __init__"""
+        market = object.__new__(cls)
+        market.id = data.get('id')
+        market.platform = 'manifold'
+        market.question = data.get('question', '')
+        market.description = data.get('description')
+        market.category = data.get('groupSlugs', [None])[0] or "Uncategorized" # Manifold uses groupSlugs
+        market.market_type = data.get('outcomeType', 'BINARY')
+        market.outcomes = _OUTCOMES_MAP.get(data.get('outcomeType'), _DEFAULT_OUTCOMES)
+        market.current_price = data.get('probability') # Manifold uses probability for binary markets
+        market.probability = data.get('probability')
+        market.volume_24h = data.get('volume24Hours', 0)
+        market.total_volume = data.get('volume', 0)
+        market.liquidity = data.get('totalLiquidity', 0)
+        market.open_time = BaseAPIClient._parse_datetime(data.get('createdTime'))
+        market.close_time = BaseAPIClient._parse_datetime(data.get('closeTime'))
+        market.resolution_date = None
+        market.status = 'open' if not data.get('isResolved') else 'resolved'
+        market.url = f"https://manifold.markets/{data.get('creatorUsername', '')}/{data.get('slug', '')}"
+        market.last_updated = now
+        market._token_set = None
+        return market
+
+    @classmethod
+    def from_polymarket(cls, data: Dict[str, Any], now: datetime) -> "MarketData":
+        """Build from a Polymarket market payload, skipping the generated __init__"""
+        market = object.__new__(cls)
+        market.id = data.get('id')
+        market.platform = 'polymarket'
+        market.question = data.get('question', '')
+        market.description = data.get('description')
+        market.category = data.get('category')
+        market.market_type = data.get('type', 'BINARY')
+        market.outcomes = data.get('outcomes', _DEFAULT_OUTCOMES)
+        market.current_price = data.get('price')
+        market.probability = data.get('probability')
+        market.volume_24h = data.get('volume24Hours', 0)
+        market.total_volume = data.get('volume', 0)
+        market.liquidity = data.get('liquidity', 0)
+        market.open_time = BaseAPIClient._parse_datetime(data.get('startDate'))
+        market.close_time = BaseAPIClient._parse_datetime(data.get('endDate'))
+        market.resolution_date = BaseAPIClient._parse_datetime(data.get('resolutionDate'))
+        market.status = 'open' if data.get('isActive') else 'closed'
+        market.url = f"https://polymarket.com/market/{data.get('slug', data.get('id'))}"
+        market.last_updated = now
+        market._token_set = None
+        return market
+
+    @classmethod
+    def from_kalshi(cls, data: Dict[str, Any], now: datetime) -> "MarketData":
+        """Build from a Kalshi market payload, skipping the generated __init__"""
+        market = object.__new__(cls)
+        market.id = data.get('ticker')
+        market.platform = 'kalshi'
+        market.question = data.get('title', '')
+        market.description = data.get('subtitle')
+        market.category = data.get('category')
+        market.market_type = 'binary'
+        market.outcomes = _DEFAULT_OUTCOMES
+        market.current_price = data.get('last_price')
+        market.probability = data.get('last_price')
+        market.volume_24h = data.get('volume_24h', 0)
+        market.total_volume = data.get('total_volume', 0)
+        market.liquidity = data.get('open_interest', 0)
+        market.open_time = BaseAPIClient._parse_timestamp(data.get('open_time'))
+        market.close_time = BaseAPIClient._parse_timestamp(data.get('close_time'))
+        market.resolution_date = BaseAPIClient._parse_timestamp(data.get('expiration_time'))
+        market.status = 'open' if data.get('is_open') else 'closed'
+        market.url = f"https://kalshi.com/trade/{data.get('ticker')}"
+        market.last_updated = now
+        market._token_set = None
+        return market
 
 @dataclass
 class OrderRequest:
@@ -117,6 +214,8 @@ class RateLimiter:
 class BaseAPIClient(ABC):
     """Base class for all prediction market API clients"""
     
+    supports_markets = True # False for clients that only share the HTTP plumbing
+
     def __init__(self, config: APIConfig):
         self.config = config
         self.api_key = config.api_key
@@ -125,15 +224,22 @@ class BaseAPIClient(ABC):
         self.session: Optional[aiohttp.ClientSession] = None
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.config.timeout),
-            headers=self._get_default_headers()
-        )
+        self._ensure_session()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
             await self.session.close()
+            self.session = None
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Return the client's long-lived session, opening it on first use"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+                headers=self._get_default_headers()
+            )
+        return self.session
     
     @abstractmethod
     def _get_default_headers(self) -> Dict[str, str]:
@@ -176,13 +282,8 @@ class BaseAPIClient(ABC):
         
         for attempt in range(self.config.retry_attempts):
             try:
-                if not self.session:
-                    self.session = aiohttp.ClientSession(
-                        timeout=aiohttp.ClientTimeout(total=self.config.timeout),
-                        headers=self._get_default_headers()
-                    )
-
-                async with self.session.request(method, url, **kwargs) as response:
+                session = self._ensure_session()
+                async with session.request(method, url, **kwargs) as response:
                     if response.status == 429:  # Rate limit exceeded
                         retry_after = int(response.headers.get('Retry-After', 60))
                         logger.warning(f"Rate limit exceeded, waiting {retry_after}s")
@@ -190,10 +291,11 @@ class BaseAPIClient(ABC):
                         continue
                     
                     response.raise_for_status() # Raise an exception for HTTP errors
-                    return await response.json()
+                    body = await response.read()
+                    return orjson.loads(body) if body else {}
             except aiohttp.ClientResponseError as e:
                 logger.error(f"API Error ({self.__class__.__name__}) {e.status} for {url}: {e.message}")
-                if attempt == self.config.retry_attempts - 1:
+                if e.status < 500 or attempt == self.config.retry_attempts - 1: # Client errors will not succeed on retry
                     raise
                 await asyncio.sleep(self.config.retry_delay * (2 ** attempt))
             except aiohttp.ClientError as e:
@@ -209,8 +311,9 @@ class BaseAPIClient(ABC):
         return {} # Should not be reached
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _parse_datetime(date_str: Optional[str]) -> Optional[datetime]:
-        """Parse datetime string from API response"""
+        """Parse datetime string from API response (memoized; markets often share close dates)"""
         if not date_str:
             return None
         try:
@@ -223,8 +326,9 @@ class BaseAPIClient(ABC):
             return None
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _parse_timestamp(timestamp: Optional[Union[int, float]]) -> Optional[datetime]:
-        """Parse Unix timestamp to datetime"""
+        """Parse Unix timestamp to datetime (memoized)"""
         if timestamp is None:
             return None
         try:
@@ -397,31 +501,8 @@ class PolymarketRealClient(BaseAPIClient):
             response = await self._make_request('GET', '/markets', params=params)
             markets = response.get('markets', [])
             
-            transformed_markets = []
-            for market in markets:
-                transformed_market = MarketData(
-                    id=market.get('id'),
-                    platform='polymarket',
-                    question=market.get('question', ''),
-                    description=market.get('description'),
-                    category=market.get('category'),
-                    market_type=market.get('type', 'BINARY'),
-                    outcomes=market.get('outcomes', ['Yes', 'No']),
-                    current_price=market.get('price'),
-                    probability=market.get('probability'),
-                    volume_24h=market.get('volume24Hours', 0),
-                    total_volume=market.get('volume', 0),
-                    liquidity=market.get('liquidity', 0),
-                    open_time=self._parse_datetime(market.get('startDate')),
-                    close_time=self._parse_datetime(market.get('endDate')),
-                    resolution_date=self._parse_datetime(market.get('resolutionDate')),
-                    status='open' if market.get('isActive') else 'closed',
-                    url=f"https://polymarket.com/market/{market.get('slug', market.get('id'))}",
-                    last_updated=datetime.utcnow()
-                )
-                transformed_markets.append(transformed_market)
-            
-            return transformed_markets
+            now = datetime.utcnow()
+            return [MarketData.from_polymarket(market, now) for market in markets]
             
         except Exception as e:
             logger.error(f"Failed to fetch Polymarket markets: {e}")
@@ -434,26 +515,7 @@ class PolymarketRealClient(BaseAPIClient):
             response = await self._make_request('GET', f'/markets/{market_id}')
             market = response.get('market', response)
             
-            return MarketData(
-                id=market.get('id'),
-                platform='polymarket',
-                question=market.get('question', ''),
-                description=market.get('description'),
-                category=market.get('category'),
-                market_type=market.get('type', 'BINARY'),
-                outcomes=market.get('outcomes', ['Yes', 'No']),
-                current_price=market.get('price'),
-                probability=market.get('probability'),
-                volume_24h=market.get('volume24Hours', 0),
-                total_volume=market.get('volume', 0),
-                liquidity=market.get('liquidity', 0),
-                open_time=self._parse_datetime(market.get('startDate')),
-                close_time=self._parse_datetime(market.get('endDate')),
-                resolution_date=self._parse_datetime(market.get('resolutionDate')),
-                status='open' if market.get('isActive') else 'closed',
-                    url=f"https://polymarket.com/market/{market.get('slug', market.get('id'))}",
-                last_updated=datetime.utcnow()
-            )
+            return MarketData.from_polymarket(market, datetime.utcnow())
             
         except Exception as e:
             logger.error(f"Failed to fetch Polymarket market {market_id}: {e}")
@@ -554,31 +616,8 @@ class KalshiRealClient(BaseAPIClient):
             response = await self._make_request('GET', '/markets', params=params)
             markets = response.get('markets', [])
             
-            transformed_markets = []
-            for market_data in markets:
-                transformed_market = MarketData(
-                    id=market_data.get('ticker'),
-                    platform='kalshi',
-                    question=market_data.get('title', ''),
-                    description=market_data.get('subtitle'),
-                    category=market_data.get('category'),
-                    market_type='binary',
-                    outcomes=['Yes', 'No'],
-                    current_price=market_data.get('last_price'),
-                    probability=market_data.get('last_price'),
-                    volume_24h=market_data.get('volume_24h', 0),
-                    total_volume=market_data.get('total_volume', 0),
-                    liquidity=market_data.get('open_interest', 0),
-                    open_time=self._parse_timestamp(market_data.get('open_time')),
-                    close_time=self._parse_timestamp(market_data.get('close_time')),
-                    resolution_date=self._parse_timestamp(market_data.get('expiration_time')),
-                    status='open' if market_data.get('is_open') else 'closed',
-                    url=f"https://kalshi.com/trade/{market_data.get('ticker')}",
-                    last_updated=datetime.utcnow()
-                )
-                transformed_markets.append(transformed_market)
-            
-            return transformed_markets
+            now = datetime.utcnow()
+            return [MarketData.from_kalshi(market_data, now) for market_data in markets]
             
         except Exception as e:
             logger.error(f"Failed to fetch Kalshi markets: {e}")
@@ -591,26 +630,7 @@ class KalshiRealClient(BaseAPIClient):
             response = await self._make_request('GET', f'/markets/{market_id}')
             market_data = response.get('market', response)
             
-            return MarketData(
-                id=market_data.get('ticker'),
-                platform='kalshi',
-                question=market_data.get('title', ''),
-                description=market_data.get('subtitle'),
-                category=market_data.get('category'),
-                market_type='binary',
-                outcomes=['Yes', 'No'],
-                current_price=market_data.get('last_price'),
-                probability=market_data.get('last_price'),
-                volume_24h=market_data.get('volume_24h', 0),
-                total_volume=market_data.get('total_volume', 0),
-                liquidity=market_data.get('open_interest', 0),
-                open_time=self._parse_timestamp(market_data.get('open_time')),
-                close_time=self._parse_timestamp(market_data.get('close_time')),
-                resolution_date=self._parse_timestamp(market_data.get('expiration_time')),
-                status='open' if market_data.get('is_open') else 'closed',
-                url=f"https://kalshi.com/trade/{market_data.get('ticker')}",
-                last_updated=datetime.utcnow()
-            )
+            return MarketData.from_kalshi(market_data, datetime.utcnow())
             
         except Exception as e:
             logger.error(f"Failed to fetch Kalshi market {market_id}: {e}")
@@ -705,45 +725,13 @@ class ManifoldRealClient(BaseAPIClient):
             response = await self._make_request('GET', '/markets', params=params)
             markets = response.get('markets', [])
             
-            transformed_markets = []
-            for market_data in markets:
-                transformed_market = MarketData(
-                    id=market_data.get('id'),
-                    platform='manifold',
-                    question=market_data.get('question', ''),
-                    description=market_data.get('description'),
-                    category=market_data.get('groupSlugs', [None])[0] or "Uncategorized", # Manifold uses groupSlugs
-                    market_type=market_data.get('outcomeType', 'BINARY'),
-                    outcomes=self._get_outcomes(market_data.get('outcomeType')),
-                    current_price=market_data.get('probability'), # Manifold uses probability for binary markets
-                    probability=market_data.get('probability'),
-                    volume_24h=market_data.get('volume24Hours', 0),
-                    total_volume=market_data.get('volume', 0),
-                    liquidity=market_data.get('totalLiquidity', 0),
-                    open_time=self._parse_datetime(market_data.get('createdTime')),
-                    close_time=self._parse_datetime(market_data.get('closeTime')),
-                    status='open' if not market_data.get('isResolved') else 'resolved',
-                    url=f"https://manifold.markets/{market_data.get('creatorUsername', '')}/{market_data.get('slug', '')}",
-                    last_updated=datetime.utcnow()
-                )
-                transformed_markets.append(transformed_market)
-            
-            return transformed_markets
+            now = datetime.utcnow()
+            return [MarketData.from_manifold(market_data, now) for market_data in markets]
             
         except Exception as e:
             logger.error(f"Failed to fetch Manifold markets: {e}")
             return []
     
-    def _get_outcomes(self, outcome_type: str) -> List[str]:
-        """Helper to get outcomes based on market type"""
-        if outcome_type == 'BINARY':
-            return ['Yes', 'No']
-        elif outcome_type == 'FREE_RESPONSE': # Not directly supported in MarketData
-            return ['Free Response']
-        elif outcome_type == 'MULTIPLE_CHOICE': # Not directly supported in MarketData
-            return ['Multiple Choice']
-        return ['Yes', 'No'] # Default for unknown types
-    
     async def get_market(self, market_id: str) -> Optional[MarketData]:
         """Get Manifold market details"""
         logger.info(f"ManifoldClient: Fetching market {market_id}")
@@ -758,7 +746,7 @@ class ManifoldRealClient(BaseAPIClient):
                 description=market_data.get('text'), # Manifold uses 'text' for description
                 category=market_data.get('groupSlugs', [None])[0] or "Uncategorized",
                 market_type=market_data.get('outcomeType', 'BINARY'),
-                outcomes=self._get_outcomes(market_data.get('outcomeType')),
+                outcomes=_OUTCOMES_MAP.get(market_data.get('outcomeType'), _DEFAULT_OUTCOMES),
                 current_price=market_data.get('probability'),
                 probability=market_data.get('probability'),
                 volume_24h=market_data.get('volume24Hours', 0),
@@ -836,6 +824,17 @@ class ManifoldRealClient(BaseAPIClient):
             logger.error(f"Failed to fetch Manifold orders: {e}")
             return []
 
+@lru_cache(maxsize=256)
+def _build_news_endpoint(query: str, from_date: str) -> str:
+    """Encode the /everything endpoint for a query; stable for a whole day"""
+    return '/everything?' + urlencode({
+        'q': query,
+        'from': from_date,
+        'sortBy': 'publishedAt',
+        'language': 'en',
+        'pageSize': 50
+    })
+
 class NewsAPIClient(BaseAPIClient):
     """
     News API Client for market sentiment analysis
@@ -844,6 +843,15 @@ class NewsAPIClient(BaseAPIClient):
     to provide sentiment analysis for prediction markets.
     """
     
+    supports_markets = False
+
+    def __init__(self, config: APIConfig):
+        super().__init__(config)
+        # Recent results keyed by (query, days_back) -> (fetched_at, articles)
+        self._news_cache: Dict[Tuple[str, int], Tuple[float, List[Dict]]] = {}
+        self._news_cache_ttl = 60 # seconds
+        self._news_cache_size = 256 # entries; the oldest is evicted first
+
     def _get_default_headers(self) -> Dict[str, str]:
         return {
             'Content-Type': 'application/json',
@@ -853,19 +861,16 @@ class NewsAPIClient(BaseAPIClient):
     
     async def get_market_news(self, query: str, days_back: int = 7) -> List[Dict]:
         """Get news articles related to a market query"""
+        cache_key = (query, days_back)
+        cached = self._news_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < self._news_cache_ttl:
+            return cached[1]
+
         logger.info(f"NewsAPIClient: Fetching news for query: {query}, days_back: {days_back}")
         try:
             from_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
             
-            params = {
-                'q': query,
-                'from': from_date,
-                'sortBy': 'publishedAt',
-                'language': 'en',
-                'pageSize': 50
-            }
-            
-            response = await self._make_request('GET', '/everything', params=params)
+            response = await self._make_request('GET', _build_news_endpoint(query, from_date))
             articles = response.get('articles', [])
             
             transformed_articles = []
@@ -882,6 +887,9 @@ class NewsAPIClient(BaseAPIClient):
                 }
                 transformed_articles.append(transformed_article)
             
+            if cache_key not in self._news_cache and len(self._news_cache) >= self._news_cache_size:
+                self._news_cache.pop(next(iter(self._news_cache))) # Evict the oldest entry
+            self._news_cache[cache_key] = (time.monotonic(), transformed_articles)
             return transformed_articles
                 
         except Exception as e:
@@ -913,10 +921,13 @@ class PredictionMarketAggregator:
     
     def __init__(self, api_configs: Dict[str, APIConfig]):
         self.api_configs = api_configs
-        self.clients: Dict[str, Union[BaseAPIClient, MockMarketClient]] = {}
-        # Cache for market data
-        self._cache: Dict[str, Dict[str, Any]] = {}
+        self.clients: Dict[str, BaseAPIClient] = {}
+        # Cache for market data, keyed by (platform, category, limit) -> (fetched_at, markets)
+        self._cache: Dict[Tuple[str, Optional[str], int], Tuple[float, List[MarketData]]] = {}
         self._cache_ttl = 60 # seconds for market list cache
+        self._platform_timeout = 5.0 # seconds a single platform may hold up get_all_markets
+        # Fetches currently running, so concurrent callers share a single request
+        self._in_flight: Dict[Tuple[str, Optional[str], int], asyncio.Task] = {}
         
     async def initialize_clients(self):
         """Initialize all API clients (real or mock) based on configurations"""
@@ -947,58 +958,122 @@ class PredictionMarketAggregator:
             else:
                 logger.warning(f"API key not configured for {platform}. Using mock client.")
                 self.clients[platform] = MockMarketClient(platform)
-                
-    async def get_all_markets(self, category: Optional[str] = None, limit_per_platform: int = 50) -> List[MarketData]:
-        """Get markets from all configured platforms"""
-        all_markets: List[MarketData] = []
-        
-        tasks_to_run = []
-        platforms_in_tasks = []
 
-        for platform, client in self.clients.items():
-            if isinstance(client, (PolymarketRealClient, KalshiRealClient, ManifoldRealClient, MockMarketClient)):
-                tasks_to_run.append(client.get_markets(category, limit_per_platform))
-                platforms_in_tasks.append(platform)
+    async def _get_markets_cached(self, platform: str, client: BaseAPIClient,
+                                  category: Optional[str], limit: int) -> List[MarketData]:
+        """Fetch a platform's market list, reusing results younger than the cache TTL
+
+        Concurrent callers asking for the same key while a fetch is running
+        await that fetch instead of issuing their own.
+        """
+        key = (platform, category, limit)
+        cached = self._cache.get(key)
+        if cached and time.monotonic() - cached[0] < self._cache_ttl:
+            return cached[1]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh_markets(key, client))
+            self._in_flight[key] = task
+        # Shielded: a caller that is cancelled leaves, the shared fetch keeps running for the rest
+        return await asyncio.shield(task)
+
+    async def _refresh_markets(self, key: Tuple[str, Optional[str], int],
+                               client: BaseAPIClient) -> List[MarketData]:
+        """Fetch a market list for the cache; owned by the aggregator, not by any one caller"""
+        _, category, limit = key
+        try:
+            markets = await client.get_markets(category, limit)
+            self._cache[key] = (time.monotonic(), markets)
+            return markets
+        finally:
+            del self._in_flight[key]
+
+    async def _fetch_platform_markets(self, platform: str, client: BaseAPIClient,
+                                      category: Optional[str], limit: int) -> List[MarketData]:
+        """Fetch one platform's markets for aggregation, giving up after the platform timeout
+
+        The fetch is shielded, so a platform that misses the deadline still
+        completes in the background and fills the cache for the next call.
+        """
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(self._get_markets_cached(platform, client, category, limit)),
+                timeout=self._platform_timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out fetching markets from {platform} after {self._platform_timeout}s")
+        except Exception as e:
+            logger.error(f"Failed to fetch markets from {platform}: {e}")
+        return []
+
+    async def get_all_markets(self, category: Optional[str] = None, limit_per_platform: int = 50,
+                              top_k: Optional[int] = None) -> List[MarketData]:
+        """Get markets from all configured platforms, optionally only the top_k by 24h volume"""
+        all_markets: List[MarketData] = []
         
-        results = await asyncio.gather(*tasks_to_run, return_exceptions=True)
+        async with asyncio.TaskGroup() as tg:
+            tasks = {
+                platform: tg.create_task(self._fetch_platform_markets(platform, client, category, limit_per_platform))
+                for platform, client in self.clients.items()
+                if client.supports_markets
+            }
         
-        for platform, result in zip(platforms_in_tasks, results):
-            if isinstance(result, Exception):
-                logger.error(f"Failed to fetch markets from {platform}: {result}")
-                continue
-            
-            markets = result
+        for platform, task in tasks.items():
+            markets = task.result()
             for market in markets:
                 market.platform = platform # Ensure platform is correctly set
+                if market.volume_24h is None: # APIs may send null volumes
+                    market.volume_24h = 0.0
             all_markets.extend(markets)
         
         # Sort by volume (descending)
-        all_markets.sort(key=lambda x: x.volume_24h, reverse=True)
+        if top_k is not None:
+            return heapq.nlargest(top_k, all_markets, key=_by_volume_24h)
+        all_markets.sort(key=_by_volume_24h, reverse=True)
         
         return all_markets
     
     async def get_market_details(self, market_id: str) -> Optional[MarketData]:
-        """Get detailed information for a specific market from its platform"""
-        for platform, client in self.clients.items():
-            if isinstance(client, (PolymarketRealClient, KalshiRealClient, ManifoldRealClient, MockMarketClient)):
-                try:
-                    market = await client.get_market(market_id)
+        """Get detailed information for a specific market from its platform
+
+        Market IDs are platform-specific, so all platforms are queried
+        concurrently and the first confirmed hit wins; the remaining lookups
+        are cancelled.
+        """
+        pending = {
+            asyncio.create_task(client.get_market(market_id)): platform
+            for platform, client in self.clients.items()
+            if client.supports_markets
+        }
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    platform = pending.pop(task)
+                    try:
+                        market = task.result()
+                    except Exception as e:
+                        logger.error(f"Error fetching market {market_id} from {platform}: {e}")
+                        continue
                     if market and market.id == market_id: # Confirm the market returned is the one requested
                         return market
-                except Exception as e:
-                    logger.error(f"Error fetching market {market_id} from {platform}: {e}")
+        finally:
+            for task in pending:
+                task.cancel()
         return None
 
     async def compare_market(self, question: str) -> Dict[str, Optional[MarketData]]:
         """Compare the same market across platforms using question similarity"""
         results: Dict[str, Optional[MarketData]] = {}
+        question_tokens = frozenset(question.lower().split())
         
         tasks_to_run = []
         platforms_in_tasks = []
 
         for platform, client in self.clients.items():
-            if isinstance(client, (PolymarketRealClient, KalshiRealClient, ManifoldRealClient, MockMarketClient)):
-                tasks_to_run.append(client.get_markets(limit=100)) # Fetch more markets for comparison
+            if client.supports_markets:
+                tasks_to_run.append(self._get_markets_cached(platform, client, None, 100)) # Fetch more markets for comparison
                 platforms_in_tasks.append(platform) # Keep track of platforms
             
         all_platform_markets = await asyncio.gather(*tasks_to_run, return_exceptions=True)
@@ -1009,35 +1084,55 @@ class PredictionMarketAggregator:
                 results[platform] = None
                 continue
             
-            best_match: Optional[MarketData] = None
-            highest_similarity = 0.0
-
-            for market in markets_result:
-                similarity = self._questions_similar(question, market.question)
-                if similarity > highest_similarity:
-                    highest_similarity = similarity
-                    best_match = market
-            
-            if best_match and highest_similarity >= 0.7: # Threshold for considering a match
-                results[platform] = best_match
-            else:
-                results[platform] = None
+            results[platform] = self._best_match(question_tokens, markets_result, 0.7) # Threshold for considering a match
         
         return results
+
+    @classmethod
+    def _best_match(cls, question_tokens: FrozenSet[str], markets: List[MarketData],
+                    threshold: float) -> Optional[MarketData]:
+        """Score a whole market list against one query and return the best match at or above threshold"""
+        best_match: Optional[MarketData] = None
+        highest_similarity = 0.0
+        similarity_of = cls._token_similarity
+
+        for market in markets:
+            similarity = similarity_of(question_tokens, market.question_tokens, threshold)
+            if similarity > highest_similarity:
+                highest_similarity = similarity
+                best_match = market
+                if similarity == 1.0: # Identical token sets cannot be beaten
+                    break
+
+        return best_match if highest_similarity >= threshold else None
     
     @staticmethod
     def _questions_similar(question1: str, question2: str, threshold: float = 0.7) -> float:
         """Calculate similarity between two questions (Jaccard index)"""
-        words1 = set(question1.lower().split())
-        words2 = set(question2.lower().split())
-        
+        return PredictionMarketAggregator._token_similarity(
+            frozenset(question1.lower().split()),
+            frozenset(question2.lower().split())
+        )
+
+    @staticmethod
+    def _token_similarity(words1: FrozenSet[str], words2: FrozenSet[str], threshold: float = 0.0) -> float:
+        """Jaccard index of two pre-tokenized questions
+
+        Pairs that provably cannot reach threshold score 0.0 without
+        building the full intersection and union.
+        """
         if not words1 or not words2:
             return 0.0
+
+        min_len, max_len = sorted((len(words1), len(words2)))
+        if min_len < threshold * max_len: # Jaccard can be at most min_len / max_len
+            return 0.0
         
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
+        overlap = len(words1.intersection(words2))
+        if overlap < threshold * max_len: # The union is at least max_len
+            return 0.0
         
-        return len(intersection) / len(union)
+        return overlap / (len(words1) + len(words2) - overlap)
 
     async def get_news_for_query(self, query: str, days_back: int = 7) -> List[Dict]:
         """Fetch news articles for a given query"""
@@ -1048,9 +1143,10 @@ class PredictionMarketAggregator:
 
     async def cleanup(self):
         """Cleanup all clients"""
+        for task in list(self._in_flight.values()): # Shared fetches outlive their callers; stop them here
+            task.cancel()
         for client in self.clients.values():
-            if isinstance(client, (PolymarketRealClient, KalshiRealClient, ManifoldRealClient, NewsAPIClient, MockMarketClient)):
-                await client.__aexit__(None, None, None) # Explicitly call aexit for real clients
+            await client.__aexit__(None, None, None) # Explicitly call aexit for real clients
         logger.info("Prediction market aggregator cleaned up")
 
 # Example usage and testing functions (now integrated into the aggregator logic)
@@ -1092,4 +1188,5 @@ async def test_aggregator():
     print("Aggregator testing complete.")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(test_aggregator())
\ No newline at end of file
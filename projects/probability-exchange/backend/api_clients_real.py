@@ -14,28 +14,81 @@ and data transformation for consistent market data.
 
 import asyncio
 import aiohttp
+import orjson
+from aiolimiter import AsyncLimiter
 import time
 import logging
 import json
 import os
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
+from contextlib import nullcontext
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
-from urllib.parse import urljoin
+from functools import lru_cache, partial
+from urllib.parse import urlsplit
 import hashlib
 import hmac
 import base64
 
+try:
+    # Optional C accelerator for ISO 8601 parsing
+    from ciso8601 import parse_datetime as _fromisoformat
+except ImportError:
+    _fromisoformat = datetime.fromisoformat
+
 # Import PolyRouter client
 from polyrouter_client import PolyRouterClient, create_polyrouter_client
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Handlers are configured by the application entrypoint, or below when run as a script
 logger = logging.getLogger(__name__)
 
-@dataclass
+# One connection pool for every client in this module, so keep-alive
+# connections and DNS lookups survive across aggregation cycles
+_SHARED_SESSION: Optional[aiohttp.ClientSession] = None
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """Return the module-wide ClientSession, creating it on first use"""
+    global _SHARED_SESSION
+    if _SHARED_SESSION is None or _SHARED_SESSION.closed:
+        _SHARED_SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=20,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            ),
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+    return _SHARED_SESSION
+
+async def close_shared_session():
+    """Close the module-wide ClientSession"""
+    global _SHARED_SESSION
+    if _SHARED_SESSION is not None:
+        await _SHARED_SESSION.close()
+        _SHARED_SESSION = None
+
+# Shared, immutable per-market constants used by the transform loops
+_BINARY_OUTCOMES = ('Yes', 'No')
+_POLYMARKET_URL_FMT = "https://polymarket.com/market/{}".format
+_KALSHI_URL_FMT = "https://kalshi.com/trade/{}".format
+_MANIFOLD_OUTCOMES = {
+    'BINARY': _BINARY_OUTCOMES,
+    'FREE_RESPONSE': ('Any answer',),
+    'MULTIPLE_CHOICE': ('Option A', 'Option B', 'Option C'),  # Would need to fetch actual options
+}
+_STATUS = ('open', 'closed')  # Indexed by `not is_open`
+_MANIFOLD_STATUS = ('open', 'resolved')  # Indexed by `bool(isResolved)`
+
+_ETAG_CACHE_SIZE = 128  # Conditional-GET entries kept per client
+
+async def _read_json(response: aiohttp.ClientResponse) -> Any:
+    """Decode a response body with orjson instead of aiohttp's stdlib json"""
+    return orjson.loads(await response.read())
+
+@dataclass(slots=True, frozen=True)
 class APIConfig:
-    """Configuration for API clients"""
+    """Configuration for API clients; immutable once a client is built from it"""
     api_key: str
     secret_key: Optional[str] = None
     base_url: str = ""
@@ -44,6 +97,132 @@ class APIConfig:
     retry_attempts: int = 3
     retry_delay: float = 1.0
 
+@lru_cache(maxsize=4096)
+def _parse_iso_datetime(date_str: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 datetime string from an API response; memoized as dates repeat across markets and polls"""
+    if not date_str:
+        return None
+    
+    try:
+        # Both ciso8601 and 3.11+ fromisoformat accept a trailing 'Z'
+        return _fromisoformat(date_str)
+    except Exception as e:
+        logger.warning("Failed to parse date %s: %s", date_str, e)
+        return None
+
+@lru_cache(maxsize=4096)
+def _parse_unix_timestamp(timestamp: Optional[float]) -> Optional[datetime]:
+    """Parse a Unix timestamp from an API response"""
+    if not timestamp:
+        return None
+    
+    try:
+        return datetime.fromtimestamp(timestamp)
+    except Exception as e:
+        logger.warning("Failed to parse timestamp %s: %s", timestamp, e)
+        return None
+
+def _transform_polymarket(market: Dict, now: datetime) -> Optional[Dict]:
+    """Transform a Polymarket market to the consistent format, or None if malformed"""
+    try:
+        market_get = market.get
+        market_id = market_get('id')
+        return {
+            'id': market_id,
+            'platform': 'polymarket',
+            'question': market_get('question', ''),
+            'description': market_get('description'),
+            'category': market_get('category'),
+            'market_type': market_get('type', 'BINARY'),
+            'outcomes': market_get('outcomes', _BINARY_OUTCOMES),
+            'current_price': market_get('price'),
+            'probability': market_get('probability'),
+            'volume_24h': market_get('volume24Hours', 0),
+            'total_volume': market_get('volume', 0),
+            'liquidity': market_get('liquidity', 0),
+            'open_time': _parse_iso_datetime(market_get('startDate')),
+            'close_time': _parse_iso_datetime(market_get('endDate')),
+            'resolution_date': _parse_iso_datetime(market_get('resolutionDate')),
+            'status': _STATUS[not market_get('isActive')],
+            'url': _POLYMARKET_URL_FMT(market_get('slug', market_id)),
+            'last_updated': now
+        }
+    except Exception as e:
+        logger.error("Error transforming Polymarket market: %s", e)
+        return None
+
+def _transform_kalshi(market: Dict, now: datetime) -> Optional[Dict]:
+    """Transform a Kalshi market to the consistent format, or None if malformed"""
+    try:
+        market_get = market.get
+        ticker = market_get('ticker')
+        last_price = market_get('last_price')
+        return {
+            'id': ticker,
+            'platform': 'kalshi',
+            'question': market_get('title', ''),
+            'description': market_get('subtitle'),
+            'category': market_get('category'),
+            'market_type': 'BINARY',  # Kalshi primarily binary
+            'outcomes': _BINARY_OUTCOMES,
+            'current_price': last_price,
+            'probability': last_price,
+            'volume_24h': market_get('volume_24h', 0),
+            'total_volume': market_get('total_volume', 0),
+            'liquidity': market_get('open_interest', 0),
+            'open_time': _parse_unix_timestamp(market_get('open_time')),
+            'close_time': _parse_unix_timestamp(market_get('close_time')),
+            'resolution_date': _parse_unix_timestamp(market_get('expiration_time')),
+            'status': _STATUS[not market_get('is_open')],
+            'url': _KALSHI_URL_FMT(ticker),
+            'last_updated': now
+        }
+    except Exception as e:
+        logger.error("Error transforming Kalshi market: %s", e)
+        return None
+
+def _transform_manifold(market: Dict, now: datetime) -> Optional[Dict]:
+    """Transform a Manifold market to the consistent format, or None if malformed"""
+    try:
+        market_get = market.get
+        probability = market_get('probability')
+        return {
+            'id': market_get('id'),
+            'platform': 'manifold',
+            'question': market_get('question', ''),
+            'description': market_get('description'),
+            'category': market_get('category'),
+            'market_type': market_get('outcomeType', 'BINARY'),
+            'outcomes': _MANIFOLD_OUTCOMES.get(market_get('outcomeType'), _BINARY_OUTCOMES),
+            'current_price': probability,
+            'probability': probability,
+            'volume_24h': market_get('volume24Hours', 0),
+            'total_volume': market_get('volume', 0),
+            'liquidity': market_get('liquidity', 0),
+            'open_time': _parse_iso_datetime(market_get('createdTime')),
+            'close_time': _parse_iso_datetime(market_get('closeTime')),
+            'status': _MANIFOLD_STATUS[bool(market_get('isResolved'))],
+            'url': f"https://manifold.markets/{market_get('creatorUsername', '')}/{market_get('slug', '')}",
+            'last_updated': now
+        }
+    except Exception as e:
+        logger.error("Error transforming Manifold market: %s", e)
+        return None
+
+def _transform_article(article: Dict) -> Dict:
+    """Project a NewsAPI article down to the fields the app uses"""
+    article_get = article.get
+    return {
+        'title': article_get('title', ''),
+        'description': article_get('description'),
+        'url': article_get('url'),
+        'published_at': _parse_iso_datetime(article_get('publishedAt')),
+        'source': (article_get('source') or {}).get('name'),
+        'author': article_get('author'),
+        'content': article_get('content'),
+        'url_to_image': article_get('urlToImage')
+    }
+
 class PolymarketRealClient:
     """
     Real Polymarket API Client
@@ -54,20 +233,22 @@ class PolymarketRealClient:
     
     def __init__(self, config: APIConfig):
         self.config = config
-        self.base_url = config.base_url or "https://gamma-api.polymarket.com"
+        self.base_url = (config.base_url or "https://gamma-api.polymarket.com").rstrip('/')
         self.session = None
-        self.rate_limit_bucket = asyncio.Semaphore(config.rate_limit // 60)  # Requests per minute
+        self._timeout = aiohttp.ClientTimeout(total=config.timeout)
+        self.rate_limit_bucket = AsyncLimiter(config.rate_limit, 60)  # Requests per minute
+        self._concurrency = asyncio.Semaphore(config.rate_limit)  # Caps in-flight requests, not rate
+        # (url, params) -> (ETag, decoded body) for conditional GETs
+        self._etag_cache: Dict[Tuple[str, Tuple], Tuple[str, Any]] = {}
+        # (category, limit) -> (decoded body, transformed markets); reused while the body is unchanged
+        self._markets_cache: Dict[Tuple[Optional[str], int], Tuple[Any, List[Dict]]] = {}
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.config.timeout),
-            headers=self._get_headers()
-        )
+        self.session = get_shared_session()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        pass # The shared session is closed by close_shared_session()
     
     def _get_headers(self) -> Dict[str, str]:
         """Get default headers for Polymarket API"""
@@ -83,30 +264,50 @@ class PolymarketRealClient:
     
     async def _rate_limited_request(self, method: str, endpoint: str, **kwargs) -> Dict:
         """Make a rate-limited API request with retry logic"""
-        async with self.rate_limit_bucket:
-            for attempt in range(self.config.retry_attempts):
-                try:
-                    url = urljoin(self.base_url, endpoint)
+        url = self.base_url + endpoint  # Endpoints start with '/'
+        for attempt in range(self.config.retry_attempts):
+            try:
+                # Take a limiter slot per attempt, so retries and 429 re-attempts are rate limited too
+                await self.rate_limit_bucket.acquire()
+                headers = self._get_headers()
+                
+                cache_key = cached = None
+                if method == 'GET':
+                    cache_key = (url, tuple(sorted((kwargs.get('params') or {}).items())))
+                    cached = self._etag_cache.get(cache_key)
+                    if cached:
+                        headers['If-None-Match'] = cached[0]
+                
+                async with self._concurrency, self.session.request(
+                        method, url, headers=headers, timeout=self._timeout, **kwargs) as response:
+                    if response.status == 304 and cached:  # Unchanged since the cached ETag
+                        return cached[1]
                     
-                    async with self.session.request(method, url, **kwargs) as response:
-                        if response.status == 429:  # Rate limit exceeded
-                            retry_after = int(response.headers.get('Retry-After', 60))
-                            logger.warning(f"Rate limit exceeded, waiting {retry_after}s")
-                            await asyncio.sleep(retry_after)
-                            continue
-                        
-                        if response.status >= 400:
-                            error_text = await response.text()
-                            raise aiohttp.ClientError(f"API Error {response.status}: {error_text}")
-                        
-                        return await response.json()
-                        
-                except Exception as e:
-                    if attempt == self.config.retry_attempts - 1:
-                        raise
+                    if response.status == 429:  # Rate limit exceeded
+                        retry_after = int(response.headers.get('Retry-After', 60))
+                    elif response.status >= 400:
+                        error_text = await response.text()
+                        raise aiohttp.ClientError(f"API Error {response.status}: {error_text}")
+                    else:
+                        data = await _read_json(response)
+                        etag = response.headers.get('ETag')
+                        if cache_key and etag:
+                            if len(self._etag_cache) >= _ETAG_CACHE_SIZE:
+                                self._etag_cache.pop(next(iter(self._etag_cache)))
+                            self._etag_cache[cache_key] = (etag, data)
+                        return data
                     
-                    logger.warning(f"Request failed (attempt {attempt + 1}): {e}")
-                    await asyncio.sleep(self.config.retry_delay * (2 ** attempt))
+            except Exception as e:
+                if attempt == self.config.retry_attempts - 1:
+                    raise
+                
+                logger.warning(f"Request failed (attempt {attempt + 1}): {e}")
+                await asyncio.sleep(self.config.retry_delay * (2 ** attempt))
+                continue
+            
+            # Sleep after leaving the response and the concurrency slot
+            logger.warning(f"Rate limit exceeded, waiting {retry_after}s")
+            await asyncio.sleep(retry_after)
     
     async def get_markets(self, category: Optional[str] = None, limit: int = 100) -> List[Dict]:
         """Get markets from Polymarket"""
@@ -124,34 +325,16 @@ class PolymarketRealClient:
             
             markets = response.get('markets', [])
             
+            # A 304 hands back the same body object, so the previous transform is still valid
+            cache_key = (category, limit)
+            cached = self._markets_cache.get(cache_key)
+            if cached and cached[0] is response:
+                return cached[1]
+            
             # Transform to consistent format
-            transformed_markets = []
-            for market in markets:
-                try:
-                    transformed_market = {
-                        'id': market.get('id'),
-                        'platform': 'polymarket',
-                        'question': market.get('question', ''),
-                        'description': market.get('description'),
-                        'category': market.get('category'),
-                        'market_type': market.get('type', 'BINARY'),
-                        'outcomes': market.get('outcomes', ['Yes', 'No']),
-                        'current_price': market.get('price'),
-                        'probability': market.get('probability'),
-                        'volume_24h': market.get('volume24Hours', 0),
-                        'total_volume': market.get('volume', 0),
-                        'liquidity': market.get('liquidity', 0),
-                        'open_time': self._parse_datetime(market.get('startDate')),
-                        'close_time': self._parse_datetime(market.get('endDate')),
-                        'resolution_date': self._parse_datetime(market.get('resolutionDate')),
-                        'status': 'open' if market.get('isActive') else 'closed',
-                        'url': f"https://polymarket.com/market/{market.get('slug', market.get('id'))}",
-                        'last_updated': datetime.utcnow()
-                    }
-                    transformed_markets.append(transformed_market)
-                except Exception as e:
-                    logger.error(f"Error transforming Polymarket market: {e}")
-                    continue
+            now = datetime.utcnow()
+            transformed_markets = [m for m in (_transform_polymarket(mk, now) for mk in markets) if m is not None]
+            self._markets_cache[cache_key] = (response, transformed_markets)
             
             logger.info(f"Retrieved {len(transformed_markets)} markets from Polymarket")
             return transformed_markets
@@ -166,45 +349,29 @@ class PolymarketRealClient:
             response = await self._rate_limited_request('GET', f'/markets/{market_id}')
             market = response.get('market', response)
             
-            return {
-                'id': market.get('id'),
-                'platform': 'polymarket',
-                'question': market.get('question', ''),
-                'description': market.get('description'),
-                'category': market.get('category'),
-                'market_type': market.get('type', 'BINARY'),
-                'outcomes': market.get('outcomes', ['Yes', 'No']),
-                'current_price': market.get('price'),
-                'probability': market.get('probability'),
-                'volume_24h': market.get('volume24Hours', 0),
-                'total_volume': market.get('volume', 0),
-                'liquidity': market.get('liquidity', 0),
-                'open_time': self._parse_datetime(market.get('startDate')),
-                'close_time': self._parse_datetime(market.get('endDate')),
-                'resolution_date': self._parse_datetime(market.get('resolutionDate')),
-                'status': 'open' if market.get('isActive') else 'closed',
-                'url': f"https://polymarket.com/market/{market.get('slug', market.get('id'))}",
-                'last_updated': datetime.utcnow()
-            }
+            return _transform_polymarket(market, datetime.utcnow())
             
         except Exception as e:
             logger.error(f"Failed to fetch Polymarket market {market_id}: {e}")
             return None
     
-    def _parse_datetime(self, date_str: Optional[str]) -> Optional[datetime]:
-        """Parse datetime string from API response"""
-        if not date_str:
-            return None
+    async def get_markets_by_ids(self, market_ids: List[str],
+                                 inflight: Optional[asyncio.Semaphore] = None) -> List[Dict]:
+        """Get several Polymarket markets concurrently, at most `inflight`'s permits at once; misses and failures are dropped"""
+        async def fetch(market_id: str) -> Optional[Dict]:
+            async with inflight or nullcontext():
+                return await self.get_market(market_id)
         
-        try:
-            # Polymarket uses ISO 8601 format
-            if date_str.endswith('Z'):
-                date_str = date_str[:-1] + '+00:00'
-            return datetime.fromisoformat(date_str)
-        except Exception as e:
-            logger.warning(f"Failed to parse date {date_str}: {e}")
-            return None
-
+        results = await asyncio.gather(*(fetch(market_id) for market_id in market_ids),
+                                       return_exceptions=True)
+        markets = []
+        for market_id, result in zip(market_ids, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to fetch Polymarket market %s: %s", market_id, result)
+            elif result:
+                markets.append(result)
+        return markets
+    
 class KalshiRealClient:
     """
     Real Kalshi API Client
@@ -215,35 +382,38 @@ class KalshiRealClient:
     
     def __init__(self, config: APIConfig):
         self.config = config
-        self.base_url = config.base_url or "https://trading-api.kalshi.com/v2"
+        self.base_url = (config.base_url or "https://trading-api.kalshi.com/v2").rstrip('/')
         self.session = None
-        self.rate_limit_bucket = asyncio.Semaphore(config.rate_limit // 60)
+        self._timeout = aiohttp.ClientTimeout(total=config.timeout)
+        self.rate_limit_bucket = AsyncLimiter(config.rate_limit, 60)  # Requests per minute
+        self._concurrency = asyncio.Semaphore(config.rate_limit)  # Caps in-flight requests, not rate
+        # (url, params) -> (ETag, decoded body) for conditional GETs
+        self._etag_cache: Dict[Tuple[str, Tuple], Tuple[str, Any]] = {}
+        # (category, limit) -> (decoded body, transformed markets); reused while the body is unchanged
+        self._markets_cache: Dict[Tuple[Optional[str], int], Tuple[Any, List[Dict]]] = {}
+        self._hmac_key = config.secret_key.encode() if config.secret_key else None
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.config.timeout),
-            headers=self._get_headers()
-        )
+        self.session = get_shared_session()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        pass # The shared session is closed by close_shared_session()
     
-    def _get_headers(self) -> Dict[str, str]:
-        """Get default headers for Kalshi API"""
+    def _get_headers(self, method: str = 'GET', path: str = '') -> Dict[str, str]:
+        """Get default headers for Kalshi API, signing method and path when a secret is configured"""
         headers = {
             'Content-Type': 'application/json',
             'User-Agent': 'MarketPulsePro/1.0',
             'X-API-Key': self.config.api_key
         }
         
-        if self.config.secret_key:
-            # Add signature for authenticated requests
+        if self._hmac_key:
+            # Add signature for authenticated requests; the secret is the key, never part of the message
             timestamp = str(int(time.time()))
-            message = timestamp + self.config.secret_key
+            message = timestamp + method + path
             signature = hmac.new(
-                self.config.secret_key.encode(),
+                self._hmac_key,
                 message.encode(),
                 hashlib.sha256
             ).hexdigest()
@@ -254,30 +424,51 @@ class KalshiRealClient:
     
     async def _rate_limited_request(self, method: str, endpoint: str, **kwargs) -> Dict:
         """Make a rate-limited API request with retry logic"""
-        async with self.rate_limit_bucket:
-            for attempt in range(self.config.retry_attempts):
-                try:
-                    url = urljoin(self.base_url, endpoint)
+        url = self.base_url + endpoint  # Endpoints start with '/'
+        path = urlsplit(url).path  # Signed with each request
+        for attempt in range(self.config.retry_attempts):
+            try:
+                # Take a limiter slot per attempt, so retries and 429 re-attempts are rate limited too
+                await self.rate_limit_bucket.acquire()
+                headers = self._get_headers(method, path)
+                
+                cache_key = cached = None
+                if method == 'GET':
+                    cache_key = (url, tuple(sorted((kwargs.get('params') or {}).items())))
+                    cached = self._etag_cache.get(cache_key)
+                    if cached:
+                        headers['If-None-Match'] = cached[0]
+                
+                async with self._concurrency, self.session.request(
+                        method, url, headers=headers, timeout=self._timeout, **kwargs) as response:
+                    if response.status == 304 and cached:  # Unchanged since the cached ETag
+                        return cached[1]
                     
-                    async with self.session.request(method, url, **kwargs) as response:
-                        if response.status == 429:
-                            retry_after = int(response.headers.get('Retry-After', 60))
-                            logger.warning(f"Kalshi rate limit exceeded, waiting {retry_after}s")
-                            await asyncio.sleep(retry_after)
-                            continue
-                        
-                        if response.status >= 400:
-                            error_text = await response.text()
-                            raise aiohttp.ClientError(f"Kalshi API Error {response.status}: {error_text}")
-                        
-                        return await response.json()
-                        
-                except Exception as e:
-                    if attempt == self.config.retry_attempts - 1:
-                        raise
+                    if response.status == 429:
+                        retry_after = int(response.headers.get('Retry-After', 60))
+                    elif response.status >= 400:
+                        error_text = await response.text()
+                        raise aiohttp.ClientError(f"Kalshi API Error {response.status}: {error_text}")
+                    else:
+                        data = await _read_json(response)
+                        etag = response.headers.get('ETag')
+                        if cache_key and etag:
+                            if len(self._etag_cache) >= _ETAG_CACHE_SIZE:
+                                self._etag_cache.pop(next(iter(self._etag_cache)))
+                            self._etag_cache[cache_key] = (etag, data)
+                        return data
                     
-                    logger.warning(f"Kalshi request failed (attempt {attempt + 1}): {e}")
-                    await asyncio.sleep(self.config.retry_delay * (2 ** attempt))
+            except Exception as e:
+                if attempt == self.config.retry_attempts - 1:
+                    raise
+                
+                logger.warning(f"Kalshi request failed (attempt {attempt + 1}): {e}")
+                await asyncio.sleep(self.config.retry_delay * (2 ** attempt))
+                continue
+            
+            # Sleep after leaving the response and the concurrency slot
+            logger.warning(f"Kalshi rate limit exceeded, waiting {retry_after}s")
+            await asyncio.sleep(retry_after)
     
     async def get_markets(self, category: Optional[str] = None, limit: int = 100) -> List[Dict]:
         """Get markets from Kalshi"""
@@ -293,34 +484,16 @@ class KalshiRealClient:
             
             markets = response.get('markets', [])
             
+            # A 304 hands back the same body object, so the previous transform is still valid
+            cache_key = (category, limit)
+            cached = self._markets_cache.get(cache_key)
+            if cached and cached[0] is response:
+                return cached[1]
+            
             # Transform to consistent format
-            transformed_markets = []
-            for market in markets:
-                try:
-                    transformed_market = {
-                        'id': market.get('ticker'),
-                        'platform': 'kalshi',
-                        'question': market.get('title', ''),
-                        'description': market.get('subtitle'),
-                        'category': market.get('category'),
-                        'market_type': 'BINARY',  # Kalshi primarily binary
-                        'outcomes': ['Yes', 'No'],
-                        'current_price': market.get('last_price'),
-                        'probability': market.get('last_price'),
-                        'volume_24h': market.get('volume_24h', 0),
-                        'total_volume': market.get('total_volume', 0),
-                        'liquidity': market.get('open_interest', 0),
-                        'open_time': self._parse_timestamp(market.get('open_time')),
-                        'close_time': self._parse_timestamp(market.get('close_time')),
-                        'resolution_date': self._parse_timestamp(market.get('expiration_time')),
-                        'status': 'open' if market.get('is_open') else 'closed',
-                        'url': f"https://kalshi.com/trade/{market.get('ticker')}",
-                        'last_updated': datetime.utcnow()
-                    }
-                    transformed_markets.append(transformed_market)
-                except Exception as e:
-                    logger.error(f"Error transforming Kalshi market: {e}")
-                    continue
+            now = datetime.utcnow()
+            transformed_markets = [m for m in (_transform_kalshi(mk, now) for mk in markets) if m is not None]
+            self._markets_cache[cache_key] = (response, transformed_markets)
             
             logger.info(f"Retrieved {len(transformed_markets)} markets from Kalshi")
             return transformed_markets
@@ -335,42 +508,29 @@ class KalshiRealClient:
             response = await self._rate_limited_request('GET', f'/markets/{market_id}')
             market = response.get('market', response)
             
-            return {
-                'id': market.get('ticker'),
-                'platform': 'kalshi',
-                'question': market.get('title', ''),
-                'description': market.get('subtitle'),
-                'category': market.get('category'),
-                'market_type': 'BINARY',
-                'outcomes': ['Yes', 'No'],
-                'current_price': market.get('last_price'),
-                'probability': market.get('last_price'),
-                'volume_24h': market.get('volume_24h', 0),
-                'total_volume': market.get('total_volume', 0),
-                'liquidity': market.get('open_interest', 0),
-                'open_time': self._parse_timestamp(market.get('open_time')),
-                'close_time': self._parse_timestamp(market.get('close_time')),
-                'resolution_date': self._parse_timestamp(market.get('expiration_time')),
-                'status': 'open' if market.get('is_open') else 'closed',
-                'url': f"https://kalshi.com/trade/{market.get('ticker')}",
-                'last_updated': datetime.utcnow()
-            }
+            return _transform_kalshi(market, datetime.utcnow())
             
         except Exception as e:
             logger.error(f"Failed to fetch Kalshi market {market_id}: {e}")
             return None
     
-    def _parse_timestamp(self, timestamp: Optional[float]) -> Optional[datetime]:
-        """Parse timestamp from API response"""
-        if not timestamp:
-            return None
+    async def get_markets_by_ids(self, market_ids: List[str],
+                                 inflight: Optional[asyncio.Semaphore] = None) -> List[Dict]:
+        """Get several Kalshi markets concurrently, at most `inflight`'s permits at once; misses and failures are dropped"""
+        async def fetch(market_id: str) -> Optional[Dict]:
+            async with inflight or nullcontext():
+                return await self.get_market(market_id)
         
-        try:
-            return datetime.fromtimestamp(timestamp)
-        except Exception as e:
-            logger.warning(f"Failed to parse timestamp {timestamp}: {e}")
-            return None
-
+        results = await asyncio.gather(*(fetch(market_id) for market_id in market_ids),
+                                       return_exceptions=True)
+        markets = []
+        for market_id, result in zip(market_ids, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to fetch Kalshi market %s: %s", market_id, result)
+            elif result:
+                markets.append(result)
+        return markets
+    
 class NewsAPIClient:
     """
     News API Client for market sentiment analysis
@@ -383,17 +543,14 @@ class NewsAPIClient:
         self.config = config
         self.base_url = config.base_url or "https://newsapi.org/v2"
         self.session = None
+        self._timeout = aiohttp.ClientTimeout(total=config.timeout)
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.config.timeout),
-            headers={'X-API-Key': self.config.api_key}
-        )
+        self.session = get_shared_session()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        pass # The shared session is closed by close_shared_session()
     
     async def get_market_news(self, query: str, days_back: int = 7) -> List[Dict]:
         """Get news articles related to a market query"""
@@ -408,25 +565,14 @@ class NewsAPIClient:
                 'pageSize': 50
             }
             
-            async with self.session.get(f'{self.base_url}/everything', params=params) as response:
+            async with self.session.get(f'{self.base_url}/everything', params=params,
+                                        headers={'X-API-Key': self.config.api_key},
+                                        timeout=self._timeout) as response:
                 if response.status == 200:
-                    data = await response.json()
-                    articles = data.get('articles', [])
+                    articles = (await _read_json(response)).get('articles', [])
                     
-                    # Transform articles to consistent format
-                    transformed_articles = []
-                    for article in articles:
-                        transformed_article = {
-                            'title': article.get('title', ''),
-                            'description': article.get('description'),
-                            'url': article.get('url'),
-                            'published_at': self._parse_datetime(article.get('publishedAt')),
-                            'source': article.get('source', {}).get('name'),
-                            'author': article.get('author'),
-                            'content': article.get('content'),
-                            'url_to_image': article.get('urlToImage')
-                        }
-                        transformed_articles.append(transformed_article)
+                    # Project articles to consistent format; the full payload is dropped on return
+                    transformed_articles = [_transform_article(article) for article in articles]
                     
                     logger.info(f"Retrieved {len(transformed_articles)} news articles for query: {query}")
                     return transformed_articles
@@ -438,17 +584,6 @@ class NewsAPIClient:
             logger.error(f"Failed to fetch news for query {query}: {e}")
             return []
     
-    def _parse_datetime(self, date_str: Optional[str]) -> Optional[datetime]:
-        """Parse datetime string from news API"""
-        if not date_str:
-            return None
-        
-        try:
-            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        except Exception as e:
-            logger.warning(f"Failed to parse news date {date_str}: {e}")
-            return None
-
 class ManifoldRealClient:
     """
     Real Manifold Markets API Client
@@ -461,17 +596,14 @@ class ManifoldRealClient:
         self.config = config
         self.base_url = config.base_url or "https://api.manifold.markets/v0"
         self.session = None
+        self._timeout = aiohttp.ClientTimeout(total=config.timeout)
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.config.timeout),
-            headers=self._get_headers()
-        )
+        self.session = get_shared_session()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        pass # The shared session is closed by close_shared_session()
     
     def _get_headers(self) -> Dict[str, str]:
         """Get default headers for Manifold API"""
@@ -493,37 +625,14 @@ class ManifoldRealClient:
             if category:
                 params['category'] = category
             
-            async with self.session.get(f'{self.base_url}/markets', params=params) as response:
+            async with self.session.get(f'{self.base_url}/markets', params=params,
+                                        headers=self._get_headers(), timeout=self._timeout) as response:
                 if response.status == 200:
-                    markets = await response.json()
+                    markets = await _read_json(response)
                     
                     # Transform to consistent format
-                    transformed_markets = []
-                    for market in markets:
-                        try:
-                            transformed_market = {
-                                'id': market.get('id'),
-                                'platform': 'manifold',
-                                'question': market.get('question', ''),
-                                'description': market.get('description'),
-                                'category': market.get('category'),
-                                'market_type': market.get('outcomeType', 'BINARY'),
-                                'outcomes': self._get_outcomes(market.get('outcomeType')),
-                                'current_price': market.get('probability'),
-                                'probability': market.get('probability'),
-                                'volume_24h': market.get('volume24Hours', 0),
-                                'total_volume': market.get('volume', 0),
-                                'liquidity': market.get('liquidity', 0),
-                                'open_time': self._parse_datetime(market.get('createdTime')),
-                                'close_time': self._parse_datetime(market.get('closeTime')),
-                                'status': 'open' if not market.get('isResolved') else 'resolved',
-                                'url': f"https://manifold.markets/{market.get('creatorUsername', '')}/{market.get('slug', '')}",
-                                'last_updated': datetime.utcnow()
-                            }
-                            transformed_markets.append(transformed_market)
-                        except Exception as e:
-                            logger.error(f"Error transforming Manifold market: {e}")
-                            continue
+                    now = datetime.utcnow()
+                    transformed_markets = [m for m in (_transform_manifold(mk, now) for mk in markets) if m is not None]
                     
                     logger.info(f"Retrieved {len(transformed_markets)} markets from Manifold")
                     return transformed_markets
@@ -535,29 +644,9 @@ class ManifoldRealClient:
             logger.error(f"Failed to fetch Manifold markets: {e}")
             return []
     
-    def _get_outcomes(self, outcome_type: str) -> List[str]:
-        """Get outcomes based on market type"""
-        if outcome_type == 'BINARY':
-            return ['Yes', 'No']
-        elif outcome_type == 'FREE_RESPONSE':
-            return ['Any answer']
-        elif outcome_type == 'MULTIPLE_CHOICE':
-            return ['Option A', 'Option B', 'Option C']  # Would need to fetch actual options
-        else:
-            return ['Yes', 'No']
-    
-    def _parse_datetime(self, date_str: Optional[str]) -> Optional[datetime]:
-        """Parse datetime string from Manifold API"""
-        if not date_str:
-            return None
-        
-        try:
-            if date_str.endswith('Z'):
-                date_str = date_str[:-1] + '+00:00'
-            return datetime.fromisoformat(date_str)
-        except Exception as e:
-            logger.warning(f"Failed to parse Manifold date {date_str}: {e}")
-            return None
+async def _get_polyrouter_markets(client, category: Optional[str], limit: int) -> List[Dict]:
+    """Adapt PolyRouter's list-of-categories signature to the standard fetcher"""
+    return await client.get_markets(categories=[category] if category else None, limit=limit)
 
 class RealPredictionMarketAggregator:
     """
@@ -566,9 +655,12 @@ class RealPredictionMarketAggregator:
     Integrates multiple real APIs and provides unified interface
     """
     
-    def __init__(self, configs: Dict[str, APIConfig]):
+    def __init__(self, configs: Dict[str, APIConfig], max_concurrency: int = 50):
         self.configs = configs
         self.clients = {}
+        # Caps concurrent platform and per-market fetches across all fan-outs; sits under the shared connector's limit=100
+        self._global_sem = asyncio.Semaphore(max_concurrency)
+        self._market_fetchers = {}  # platform -> async (category, limit) callable
         
     async def initialize_clients(self):
         """Initialize API clients"""
@@ -576,17 +668,22 @@ class RealPredictionMarketAggregator:
             try:
                 if platform == 'polymarket':
                     self.clients[platform] = PolymarketRealClient(config)
+                    self._market_fetchers[platform] = self.clients[platform].get_markets
                 elif platform == 'kalshi':
                     self.clients[platform] = KalshiRealClient(config)
+                    self._market_fetchers[platform] = self.clients[platform].get_markets
                 elif platform == 'manifold':
                     self.clients[platform] = ManifoldRealClient(config)
+                    self._market_fetchers[platform] = self.clients[platform].get_markets
                 elif platform == 'polyrouter':
                     # Use the PolyRouter client
                     self.clients[platform] = create_polyrouter_client(config.api_key)
                     if self.clients[platform] is None:
                         logger.warning("Failed to create PolyRouter client - no API key")
                         continue
+                    self._market_fetchers[platform] = partial(_get_polyrouter_markets, self.clients[platform])
                 elif platform == 'dflow':
+                    # DFlow is a trading-only client, so it gets no market fetcher
                     # Import DFlow client dynamically
                     try:
                         from dflow_client import DFlowAPIClient, DFlowConfig
@@ -614,63 +711,60 @@ class RealPredictionMarketAggregator:
     
     async def get_all_markets(self, category: Optional[str] = None, limit_per_platform: int = 50) -> List[Dict]:
         """Get markets from all configured real platforms"""
-        all_markets = []
-        
-        # Create tasks for concurrent API calls
-        tasks = []
-        for platform, client in self.clients.items():
-            if platform != 'news':  # News is not a market platform
-                task = self._get_markets_safe(client, category, limit_per_platform)
-                tasks.append((platform, task))
-        
-        # Execute all requests concurrently
-        results = await asyncio.gather(*[task for _, task in tasks], return_exceptions=True)
-        
-        for (platform, _), result in zip(tasks, results):
-            if isinstance(result, Exception):
-                logger.error(f"Failed to fetch markets from {platform}: {result}")
-                continue
-            
-            markets = result
+        # Tag and project each platform's markets as soon as it answers, so the
+        # work overlaps with the platforms that are still in flight
+        by_platform = {}
+        fetches = [self._get_platform_markets(platform, category, limit_per_platform)
+                   for platform in self._market_fetchers]  # Only platforms that serve market data
+        for next_result in asyncio.as_completed(fetches):
+            platform, markets = await next_result
+            volumes = []  # Sort keys, projected once per market
             for market in markets:
                 market['platform'] = platform  # Ensure platform is set
-            
-            all_markets.extend(markets)
+                volumes.append(market.get('volume_24h') or 0)
+            by_platform[platform] = (markets, volumes)
         
-        # Sort by volume (descending)
-        all_markets.sort(key=lambda x: x.get('volume_24h', 0), reverse=True)
+        # Merge in registry order so ties keep a stable platform order
+        all_markets = []
+        volumes = []
+        for platform in self._market_fetchers:
+            if platform in by_platform:
+                markets, platform_volumes = by_platform[platform]
+                all_markets.extend(markets)
+                volumes.extend(platform_volumes)
+        
+        # Sort by volume (descending) via precomputed keys instead of a per-comparison lambda
+        order = sorted(range(len(all_markets)), key=volumes.__getitem__, reverse=True)
+        all_markets = [all_markets[i] for i in order]
         
         logger.info(f"Aggregated {len(all_markets)} markets from {len(self.clients)} platforms")
         return all_markets
     
-    async def _get_markets_safe(self, client, category: Optional[str], limit: int) -> List[Dict]:
-        """Safely get markets from a client"""
+    async def _get_platform_markets(self, platform: str, category: Optional[str], limit: int) -> Tuple[str, List[Dict]]:
+        """Fetch one platform's markets, keeping the platform alongside the result"""
+        return platform, await self._get_markets_safe(platform, category, limit)
+    
+    async def _get_markets_safe(self, platform: str, category: Optional[str], limit: int) -> List[Dict]:
+        """Safely get markets from a platform's registered fetcher"""
         try:
-            async with client:
-                # Handle different client types
-                if hasattr(client, '__class__'):
-                    client_name = client.__class__.__name__
-
-                    # PolyRouter has different signature
-                    if client_name == 'PolyRouterClient':
-                        # PolyRouter expects categories as a list
-                        categories = [category] if category else None
-                        return await client.get_markets(categories=categories, limit=limit)
-
-                    # DFlow doesn't have get_markets - skip it
-                    elif client_name == 'DFlowAPIClient':
-                        logger.info("Skipping DFlow client for market data (trading-only client)")
-                        return []
-
-                    # Standard clients (Polymarket, Kalshi, Manifold)
-                    else:
-                        return await client.get_markets(category, limit)
-
-                # Fallback to standard call
-                return await client.get_markets(category, limit)
+            async with self._global_sem, self.clients[platform]:
+                return await self._market_fetchers[platform](category, limit)
 
         except Exception as e:
-            logger.error(f"Error getting markets from client: {e}")
+            logger.error(f"Error getting markets from {platform}: {e}")
+            return []
+    
+    async def get_markets_by_ids(self, platform: str, market_ids: List[str]) -> List[Dict]:
+        """Get several markets from one platform in a single concurrent fan-out"""
+        client = self.clients.get(platform)
+        if client is None or not hasattr(client, 'get_markets_by_ids'):
+            logger.warning(f"Batch market lookup not supported for platform: {platform}")
+            return []
+        try:
+            async with client:
+                return await client.get_markets_by_ids(market_ids, self._global_sem)
+        except Exception as e:
+            logger.error(f"Error getting markets by id from {platform}: {e}")
             return []
     
     async def get_market_news(self, query: str, days_back: int = 7) -> List[Dict]:
@@ -687,18 +781,32 @@ class RealPredictionMarketAggregator:
     
     async def cleanup(self):
         """Cleanup all clients"""
-        # Note: Context managers handle cleanup automatically
+        # Note: Context managers handle per-client cleanup; the pooled session is closed here
+        await close_shared_session()
         logger.info("Real prediction market aggregator cleaned up")
 
 # Configuration and testing functions
+# Environment variables create_api_configs reads; their values key the built configs
+_API_ENV_KEYS = (
+    'POLYMARKET_API_KEY', 'KALSHI_API_KEY', 'KALSHI_SECRET_KEY', 'MANIFOLD_API_KEY',
+    'POLYROUTER_API_KEY', 'DFLOW_API_KEY', 'NEWS_API_KEY',
+)
+
 def create_api_configs() -> Dict[str, APIConfig]:
-    """Create API configurations from environment variables or defaults"""
-    import os
+    """Create API configurations from environment variables or defaults, rebuilt only when they change"""
+    environ = os.environ
+    # A fresh dict per caller; the cached one is shared, and the frozen APIConfigs are safe to share
+    return dict(_build_api_configs(tuple(environ.get(key, '') for key in _API_ENV_KEYS)))
+
+@lru_cache(maxsize=1)
+def _build_api_configs(env_values: Tuple[str, ...]) -> Dict[str, APIConfig]:
+    """Build API configurations for one snapshot of the API environment variables"""
+    env = dict(zip(_API_ENV_KEYS, env_values))
 
     configs = {}
 
     # Polymarket configuration
-    polymarket_key = os.getenv('POLYMARKET_API_KEY', '')
+    polymarket_key = env['POLYMARKET_API_KEY']
     if polymarket_key:
         configs['polymarket'] = APIConfig(
             api_key=polymarket_key,
@@ -707,8 +815,8 @@ def create_api_configs() -> Dict[str, APIConfig]:
         )
 
     # Kalshi configuration
-    kalshi_key = os.getenv('KALSHI_API_KEY', '')
-    kalshi_secret = os.getenv('KALSHI_SECRET_KEY', '')
+    kalshi_key = env['KALSHI_API_KEY']
+    kalshi_secret = env['KALSHI_SECRET_KEY']
     if kalshi_key:
         configs['kalshi'] = APIConfig(
             api_key=kalshi_key,
@@ -718,7 +826,7 @@ def create_api_configs() -> Dict[str, APIConfig]:
         )
 
     # Manifold configuration
-    manifold_key = os.getenv('MANIFOLD_API_KEY', '')
+    manifold_key = env['MANIFOLD_API_KEY']
     if manifold_key:
         configs['manifold'] = APIConfig(
             api_key=manifold_key,
@@ -727,7 +835,7 @@ def create_api_configs() -> Dict[str, APIConfig]:
         )
 
     # PolyRouter configuration (Multi-platform aggregator)
-    polyrouter_key = os.getenv('POLYROUTER_API_KEY', '')
+    polyrouter_key = env['POLYROUTER_API_KEY']
     if polyrouter_key:
         configs['polyrouter'] = APIConfig(
             api_key=polyrouter_key,
@@ -739,7 +847,7 @@ def create_api_configs() -> Dict[str, APIConfig]:
         logger.info("PolyRouter API key not found - add POLYROUTER_API_KEY to enable unified platform access")
 
     # DFlow configuration (Solana prediction markets)
-    dflow_key = os.getenv('DFLOW_API_KEY', '')
+    dflow_key = env['DFLOW_API_KEY']
     # DFlow may work without API key for public endpoints
     configs['dflow'] = APIConfig(
         api_key=dflow_key if dflow_key else '',
@@ -748,7 +856,7 @@ def create_api_configs() -> Dict[str, APIConfig]:
     )
 
     # News API configuration
-    news_api_key = os.getenv('NEWS_API_KEY', '')
+    news_api_key = env['NEWS_API_KEY']
     if news_api_key:
         configs['news'] = APIConfig(
             api_key=news_api_key,
@@ -798,4 +906,5 @@ async def test_real_apis():
     print("Real API client testing completed!")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(test_real_apis())
\ No newline at end of file
@@ -93,8 +93,7 @@ from app.core.config_simple import settings
 from .news import news_router
 from .dflow_trading import dflow_router
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Handlers are configured once by the application entrypoint (app.core.logger.setup_logging)
 logger = logging.getLogger(__name__)
 
 # Initialize API router
@@ -31,8 +31,7 @@ from real_api_clients import (
     create_api_configs
 )
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Handlers are configured once by the application entrypoint (app.core.logger.setup_logging)
 logger = logging.getLogger(__name__)
 
 # Initialize API router
@@ -13,30 +13,38 @@ Integrates with DFlow pond.dflow.net API for tokenized Kalshi markets on Solana.
 """
 
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import JSONResponse
-from typing import List, Dict, Optional, Any
+from fastapi.responses import JSONResponse, ORJSONResponse
+from typing import List, Dict, NamedTuple, Optional, Any
 from pydantic import BaseModel, Field
+import asyncio
 import logging
 import sys
 import os
+import time
 from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
+from pathlib import Path
 
-# Add paths for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+# Make the backend root importable for the top-level client modules (once, without duplicates)
+_BACKEND_ROOT = str(Path(__file__).resolve().parents[3])
+if _BACKEND_ROOT not in sys.path:
+    sys.path.append(_BACKEND_ROOT)
 
 from dflow_client import DFlowAPIClient, DFlowConfig, create_dflow_config
 from solana_wallet import SolanaWalletManager
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Handlers are configured once by the application entrypoint (app.core.logger.setup_logging)
 logger = logging.getLogger(__name__)
 
-# Initialize API router
-dflow_router = APIRouter()
+# Initialize API router; responses are rendered with orjson
+dflow_router = APIRouter(default_response_class=ORJSONResponse)
 
 # Global instances
 dflow_client: Optional[DFlowAPIClient] = None
 solana_wallet_manager: Optional[SolanaWalletManager] = None
+_dflow_lock = asyncio.Lock()
+_wallet_lock = asyncio.Lock()
 
 
 # ============================================================================
@@ -77,20 +85,32 @@ class SwapExecuteRequest(BaseModel):
 
 async def get_dflow_client() -> DFlowAPIClient:
     """Dependency to get DFlow API client"""
-    global dflow_client
     if dflow_client is None:
-        await initialize_dflow_client()
+        # Serialize cold-start requests so only one of them builds the client
+        async with _dflow_lock:
+            await initialize_dflow_client()
     return dflow_client
 
 
 async def get_solana_wallet_manager() -> SolanaWalletManager:
     """Dependency to get Solana wallet manager"""
-    global solana_wallet_manager
     if solana_wallet_manager is None:
-        await initialize_solana_wallet_manager()
+        async with _wallet_lock:
+            await initialize_solana_wallet_manager()
     return solana_wallet_manager
 
 
+class DFlowDeps(NamedTuple):
+    """DFlow client and wallet manager, resolved together for authenticated endpoints"""
+    client: DFlowAPIClient
+    wallet_manager: SolanaWalletManager
+
+
+async def get_dflow_deps() -> DFlowDeps:
+    """Dependency to get both the DFlow API client and the Solana wallet manager"""
+    return DFlowDeps(await get_dflow_client(), await get_solana_wallet_manager())
+
+
 async def initialize_dflow_client():
     """Initialize DFlow API client"""
     global dflow_client
@@ -100,11 +120,26 @@ async def initialize_dflow_client():
     logger.info("Initializing DFlow API Client...")
 
     config = create_dflow_config()
-    dflow_client = DFlowAPIClient(config)
+    client = DFlowAPIClient(config)
+    # Open the client's pooled session once; endpoints share it until close_dflow_client()
+    await client.__aenter__()
+    dflow_client = client  # Published only once it is ready to use
 
     logger.info("DFlow API Client initialized")
 
 
+async def close_dflow_client():
+    """Close the DFlow API client's session on application shutdown"""
+    global dflow_client
+    if dflow_client is None:
+        return
+
+    await dflow_client.__aexit__(None, None, None)
+    dflow_client = None
+
+    logger.info("DFlow API Client closed")
+
+
 async def initialize_solana_wallet_manager():
     """Initialize Solana wallet manager"""
     global solana_wallet_manager
@@ -119,6 +154,17 @@ async def initialize_solana_wallet_manager():
     logger.info("Solana Wallet Manager initialized")
 
 
+@lru_cache(maxsize=1)
+def _utc_iso_for_second(second: int) -> str:
+    """Format a UTC epoch second; cached so a burst of requests shares one string"""
+    return datetime.utcfromtimestamp(second).isoformat()
+
+
+async def now_iso() -> str:
+    """Dependency providing the response timestamp, computed once per request"""
+    return _utc_iso_for_second(int(time.time()))
+
+
 # ============================================================================
 # Authentication Endpoints
 # ============================================================================
@@ -198,7 +244,8 @@ async def verify_solana_auth_signature(
 async def get_dflow_markets(
     category: Optional[str] = None,
     limit: int = 100,
-    client: DFlowAPIClient = Depends(get_dflow_client)
+    client: DFlowAPIClient = Depends(get_dflow_client),
+    now: str = Depends(now_iso)
 ):
     """
     Get available tokenized prediction markets from DFlow
@@ -206,15 +253,14 @@ async def get_dflow_markets(
     These are Kalshi markets available as SPL tokens on Solana.
     """
     try:
-        async with client:
-            markets = await client.get_prediction_markets(category, limit)
+        markets = await client.get_prediction_markets(category, limit)
 
         return {
             "markets": markets,
             "total": len(markets),
             "platform": "dflow",
             "chain": "solana",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now
         }
 
     except Exception as e:
@@ -225,19 +271,19 @@ async def get_dflow_markets(
 @dflow_router.get("/markets/{market_id}")
 async def get_dflow_market_detail(
     market_id: str,
-    client: DFlowAPIClient = Depends(get_dflow_client)
+    client: DFlowAPIClient = Depends(get_dflow_client),
+    now: str = Depends(now_iso)
 ):
     """Get detailed information about a specific DFlow prediction market"""
     try:
-        async with client:
-            market = await client.get_market_detail(market_id)
+        market = await client.get_market_detail(market_id)
 
         if not market:
             raise HTTPException(status_code=404, detail="Market not found")
 
         return {
             "market": market,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now
         }
 
     except HTTPException:
@@ -254,7 +300,8 @@ async def get_dflow_market_detail(
 @dflow_router.post("/trading/quote")
 async def get_swap_quote(
     request: SwapQuoteRequest,
-    client: DFlowAPIClient = Depends(get_dflow_client)
+    client: DFlowAPIClient = Depends(get_dflow_client),
+    now: str = Depends(now_iso)
 ):
     """
     Get a swap quote for trading prediction market tokens
@@ -262,13 +309,12 @@ async def get_swap_quote(
     Example: Get quote for swapping USDC to YES token on a market
     """
     try:
-        async with client:
-            quote = await client.get_swap_quote(
-                input_token=request.input_token,
-                output_token=request.output_token,
-                amount=request.amount,
-                slippage_tolerance=request.slippage_tolerance
-            )
+        quote = await client.get_swap_quote(
+            input_token=request.input_token,
+            output_token=request.output_token,
+            amount=request.amount,
+            slippage_tolerance=request.slippage_tolerance
+        )
 
         if not quote:
             raise HTTPException(status_code=400, detail="Failed to get swap quote")
@@ -284,7 +330,7 @@ async def get_swap_quote(
                 "route": quote.route,
                 "expires_at": quote.expires_at.isoformat()
             },
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now
         }
 
     except HTTPException:
@@ -297,8 +343,8 @@ async def get_swap_quote(
 @dflow_router.post("/trading/swap")
 async def execute_swap(
     request: SwapExecuteRequest,
-    client: DFlowAPIClient = Depends(get_dflow_client),
-    wallet_manager: SolanaWalletManager = Depends(get_solana_wallet_manager)
+    deps: DFlowDeps = Depends(get_dflow_deps),
+    now: str = Depends(now_iso)
 ):
     """
     Execute a token swap transaction
@@ -309,6 +355,7 @@ async def execute_swap(
 
     Returns transaction data that must be signed by the user's wallet.
     """
+    client, wallet_manager = deps
     try:
         # Verify session
         session = wallet_manager.verify_session(request.session_id)
@@ -318,42 +365,41 @@ async def execute_swap(
         if session['wallet_address'] != request.wallet_address:
             raise HTTPException(status_code=403, detail="Wallet address mismatch")
 
-        async with client:
-            if request.mode == "imperative":
-                # First get quote
-                quote = await client.get_swap_quote(
-                    input_token=request.input_token,
-                    output_token=request.output_token,
-                    amount=request.amount,
-                    slippage_tolerance=request.slippage_tolerance
-                )
-
-                if not quote:
-                    raise HTTPException(status_code=400, detail="Failed to get swap quote")
-
-                # Execute imperative swap
-                result = await client.execute_swap_imperative(
-                    quote=quote,
-                    user_public_key=request.wallet_address,
-                    priority_fee=request.priority_fee
-                )
-
-            else:  # declarative mode
-                # Execute declarative swap
-                result = await client.execute_swap_declarative(
-                    input_token=request.input_token,
-                    output_token=request.output_token,
-                    amount=request.amount,
-                    user_public_key=request.wallet_address,
-                    slippage_tolerance=request.slippage_tolerance
-                )
+        if request.mode == "imperative":
+            # First get quote
+            quote = await client.get_swap_quote(
+                input_token=request.input_token,
+                output_token=request.output_token,
+                amount=request.amount,
+                slippage_tolerance=request.slippage_tolerance
+            )
+
+            if not quote:
+                raise HTTPException(status_code=400, detail="Failed to get swap quote")
+
+            # Execute imperative swap
+            result = await client.execute_swap_imperative(
+                quote=quote,
+                user_public_key=request.wallet_address,
+                priority_fee=request.priority_fee
+            )
+
+        else:  # declarative mode
+            # Execute declarative swap
+            result = await client.execute_swap_declarative(
+                input_token=request.input_token,
+                output_token=request.output_token,
+                amount=request.amount,
+                user_public_key=request.wallet_address,
+                slippage_tolerance=request.slippage_tolerance
+            )
 
         return {
             "success": True,
             "mode": request.mode,
             "result": result,
             "wallet_address": request.wallet_address,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now
         }
 
     except HTTPException:
@@ -366,16 +412,16 @@ async def execute_swap(
 @dflow_router.get("/trading/order/{order_id}")
 async def get_order_status(
     order_id: str,
-    client: DFlowAPIClient = Depends(get_dflow_client)
+    client: DFlowAPIClient = Depends(get_dflow_client),
+    now: str = Depends(now_iso)
 ):
     """Get status of a swap order"""
     try:
-        async with client:
-            status = await client.get_order_status(order_id)
+        status = await client.get_order_status(order_id)
 
         return {
             "order": status,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now
         }
 
     except Exception as e:
@@ -387,40 +433,48 @@ async def get_order_status(
 # Portfolio Endpoints
 # ============================================================================
 
+_position_fields = attrgetter(
+    "market_id", "token_mint", "outcome", "shares", "average_price", "current_value", "pnl", "platform"
+)
+
+
+def _serialize_position(position) -> Dict[str, Any]:
+    """Serialize a MarketPosition, with Decimal amounts as strings"""
+    market_id, token_mint, outcome, shares, average_price, current_value, pnl, platform = _position_fields(position)
+    return {
+        "market_id": market_id,
+        "token_mint": token_mint,
+        "outcome": outcome,
+        "shares": str(shares),
+        "average_price": str(average_price),
+        "current_value": str(current_value),
+        "pnl": str(pnl),
+        "platform": platform
+    }
+
+
 @dflow_router.get("/portfolio/positions/{wallet_address}")
 async def get_user_positions(
     wallet_address: str,
     session_id: str,
-    client: DFlowAPIClient = Depends(get_dflow_client),
-    wallet_manager: SolanaWalletManager = Depends(get_solana_wallet_manager)
+    deps: DFlowDeps = Depends(get_dflow_deps),
+    now: str = Depends(now_iso)
 ):
     """Get user's prediction market positions on Solana"""
+    client, wallet_manager = deps
     try:
         # Verify session
         session = wallet_manager.verify_session(session_id)
         if not session or session['wallet_address'] != wallet_address:
             raise HTTPException(status_code=401, detail="Unauthorized")
 
-        async with client:
-            positions = await client.get_user_positions(wallet_address)
+        positions = await client.get_user_positions(wallet_address)
 
         return {
             "wallet_address": wallet_address,
-            "positions": [
-                {
-                    "market_id": pos.market_id,
-                    "token_mint": pos.token_mint,
-                    "outcome": pos.outcome,
-                    "shares": str(pos.shares),
-                    "average_price": str(pos.average_price),
-                    "current_value": str(pos.current_value),
-                    "pnl": str(pos.pnl),
-                    "platform": pos.platform
-                }
-                for pos in positions
-            ],
+            "positions": [_serialize_position(pos) for pos in positions],
             "total": len(positions),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now
         }
 
     except HTTPException:
@@ -435,23 +489,23 @@ async def get_wallet_balance(
     wallet_address: str,
     session_id: str,
     token_mint: Optional[str] = None,
-    client: DFlowAPIClient = Depends(get_dflow_client),
-    wallet_manager: SolanaWalletManager = Depends(get_solana_wallet_manager)
+    deps: DFlowDeps = Depends(get_dflow_deps),
+    now: str = Depends(now_iso)
 ):
     """Get Solana wallet token balances"""
+    client, wallet_manager = deps
     try:
         # Verify session
         session = wallet_manager.verify_session(session_id)
         if not session or session['wallet_address'] != wallet_address:
             raise HTTPException(status_code=401, detail="Unauthorized")
 
-        async with client:
-            balance = await client.get_wallet_balance(wallet_address, token_mint)
+        balance = await client.get_wallet_balance(wallet_address, token_mint)
 
         return {
             "wallet_address": wallet_address,
             "balance": balance,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now
         }
 
     except HTTPException:
@@ -468,17 +522,17 @@ async def get_wallet_balance(
 @dflow_router.get("/tokens")
 async def get_available_tokens(
     include_decimals: bool = True,
-    client: DFlowAPIClient = Depends(get_dflow_client)
+    client: DFlowAPIClient = Depends(get_dflow_client),
+    now: str = Depends(now_iso)
 ):
     """Get list of available tokens for trading"""
     try:
-        async with client:
-            tokens = await client.get_available_tokens(include_decimals)
+        tokens = await client.get_available_tokens(include_decimals)
 
         return {
             "tokens": tokens,
             "total": len(tokens),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now
         }
 
     except Exception as e:
@@ -488,17 +542,17 @@ async def get_available_tokens(
 
 @dflow_router.get("/venues")
 async def get_trading_venues(
-    client: DFlowAPIClient = Depends(get_dflow_client)
+    client: DFlowAPIClient = Depends(get_dflow_client),
+    now: str = Depends(now_iso)
 ):
     """Get list of liquidity venues"""
     try:
-        async with client:
-            venues = await client.get_trading_venues()
+        venues = await client.get_trading_venues()
 
         return {
             "venues": venues,
             "total": len(venues),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now
         }
 
     except Exception as e:
@@ -512,12 +566,12 @@ async def get_trading_venues(
 
 @dflow_router.get("/health")
 async def dflow_health_check(
-    client: DFlowAPIClient = Depends(get_dflow_client)
+    client: DFlowAPIClient = Depends(get_dflow_client),
+    now: str = Depends(now_iso)
 ):
     """DFlow trading service health check"""
     try:
-        async with client:
-            is_healthy = await client.health_check()
+        is_healthy = await client.health_check()
 
         return {
             "status": "healthy" if is_healthy else "degraded",
@@ -525,7 +579,7 @@ async def dflow_health_check(
             "chain": "solana",
             "version": "1.0.0",
             "api_accessible": is_healthy,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now
         }
 
     except Exception as e:
@@ -534,5 +588,5 @@ async def dflow_health_check(
             "status": "unhealthy",
             "service": "dflow-trading",
             "error": str(e),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now
         }
@@ -6,10 +6,20 @@ Environment-based configuration with validation and type safety.
 """
 
 import os
+import re
+from functools import cached_property, lru_cache
 from typing import List, Optional
 from pydantic import Field, validator
 from pydantic_settings import BaseSettings
 
+_CSV_SEPARATOR = re.compile(r"\s*,\s*")
+
+def _split_csv(v):
+    """Split a comma-separated env value into stripped items; lists pass through unchanged"""
+    if isinstance(v, str):
+        return _CSV_SEPARATOR.split(v.strip())
+    return v
+
 class Settings(BaseSettings):
     """Application settings"""
     
@@ -27,8 +37,9 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = Field(..., env="DATABASE_URL")
-    database_pool_size: int = Field(default=10, env="DATABASE_POOL_SIZE")
-    database_max_overflow: int = Field(default=20, env="DATABASE_MAX_OVERFLOW")
+    database_pool_size: int = Field(default=20, env="DATABASE_POOL_SIZE")
+    database_max_overflow: int = Field(default=30, env="DATABASE_MAX_OVERFLOW")
+    database_pool_recycle: int = Field(default=1800, env="DATABASE_POOL_RECYCLE")  # seconds
     
     # Redis
     redis_url: str = Field(default="redis://localhost:6379/0", env="REDIS_URL")
@@ -108,40 +119,17 @@ class Settings(BaseSettings):
     swagger_ui: bool = Field(default=True, env="SWAGGER_UI")
     docs_url: str = Field(default="/docs", env="DOCS_URL")
     
-    @validator("cors_origins", pre=True)
-    def parse_cors_origins(cls, v):
-        """Parse CORS origins from string or list"""
-        if isinstance(v, str):
-            return [origin.strip() for origin in v.split(",")]
-        return v
-    
-    @validator("allowed_hosts", pre=True)
-    def parse_allowed_hosts(cls, v):
-        """Parse allowed hosts from string or list"""
-        if isinstance(v, str):
-            return [host.strip() for host in v.split(",")]
-        return v
-    
-    @validator("allowed_jurisdictions", pre=True)
-    def parse_allowed_jurisdictions(cls, v):
-        """Parse allowed jurisdictions from string or list"""
-        if isinstance(v, str):
-            return [jurisdiction.strip() for jurisdiction in v.split(",")]
-        return v
-    
-    @validator("blocked_jurisdictions", pre=True)
-    def parse_blocked_jurisdictions(cls, v):
-        """Parse blocked jurisdictions from string or list"""
-        if isinstance(v, str):
-            return [jurisdiction.strip() for jurisdiction in v.split(",")]
-        return v
+    @validator("cors_origins", "allowed_hosts", "allowed_jurisdictions", "blocked_jurisdictions", pre=True)
+    def parse_comma_separated(cls, v):
+        """Parse CORS origins, hosts and jurisdictions from a comma-separated string or list"""
+        return _split_csv(v)
     
-    @property
+    @cached_property
     def is_development(self) -> bool:
         """Check if running in development mode"""
         return self.environment.lower() == "development"
     
-    @property
+    @cached_property
     def is_production(self) -> bool:
         """Check if running in production mode"""
         return self.environment.lower() == "production"
@@ -163,5 +151,13 @@ class Settings(BaseSettings):
         extra = "ignore"
         # env_prefix = "MARKETPULSE_"
 
-# Global settings instance
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build the global settings instance on first use"""
+    return Settings()
+
+def __getattr__(name: str):
+    """Resolve the module-level `settings` lazily (PEP 562)"""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,6 +6,7 @@ import logging
 import os
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -21,7 +22,8 @@ async def init_db():
     try:
         # Check if we are using SQLite
         database_url = settings.database_url
-        if database_url.startswith("sqlite"):
+        is_sqlite = database_url.startswith("sqlite")
+        if is_sqlite:
              # Ensure the directory exists for sqlite
             if "///" in database_url:
                 db_path = database_url.split("///")[1]
@@ -41,11 +43,26 @@ async def init_db():
 
         logger.info(f"Initializing database connection to {database_url.split('@')[-1] if '@' in database_url else 'local db'}")
 
+        # Size the pool for bursty async traffic; pre-ping and recycle replace
+        # connections the server has dropped. aiosqlite gains nothing from a
+        # queue pool, but an in-memory database must keep its one connection.
+        if is_sqlite:
+            in_memory = ":memory:" in database_url or "///" not in database_url
+            pool_kwargs = {"poolclass": StaticPool if in_memory else NullPool}
+        else:
+            pool_kwargs = {
+                "pool_size": settings.database_pool_size,
+                "max_overflow": settings.database_max_overflow,
+                "pool_pre_ping": True,
+                "pool_recycle": settings.database_pool_recycle,
+            }
+
         # Create engine
         engine = create_async_engine(
             database_url,
             echo=settings.debug,
             future=True,
+            **pool_kwargs
             # connect_args={"check_same_thread": False} if "sqlite" in database_url else {}
         )
 
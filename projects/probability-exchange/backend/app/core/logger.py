@@ -3,14 +3,59 @@
 Logging configuration for MarketPulse Pro
 """
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+import orjson
+
+# Writes stdout on a background thread so log calls never block the event loop
+_listener: Optional[QueueListener] = None
+
+class OrjsonFormatter(logging.Formatter):
+    """Render each record as a single JSON line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return orjson.dumps({
+            "timestamp": self.formatTime(record),
+            "logger": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }).decode()
 
 def setup_logging():
-    """Setup basic logging configuration"""
+    """Setup queued JSON logging on the root logger"""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(OrjsonFormatter())
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+    # QueueHandler pre-renders the message (and any traceback) before enqueueing
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    # force: replace any handler an earlier basicConfig (or library) installed on the root logger
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
+            queue_handler
+        ],
+        force=True
     )
+
+def stop_logging():
+    """Flush queued records, stop the background writer and log straight to stdout until the next setup"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+        # Without a listener the queue would only grow; records after shutdown are written directly
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(OrjsonFormatter())
+        logging.basicConfig(level=logging.INFO, handlers=[stream_handler], force=True)
@@ -2,20 +2,41 @@
 """
 Security utilities for MarketPulse Pro
 """
-from datetime import datetime, timedelta
-from typing import Optional, Dict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Optional, Dict, Tuple
 import logging
+import time
+
+import jwt
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    """Create JWT access token (placeholder for demo)"""
-    # In production, this would use JWT encoding
-    return "demo_token_" + str(datetime.utcnow().timestamp())
+    """Create a signed JWT access token"""
+    expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=settings.jwt_expire_minutes))
+    return jwt.encode({**data, "exp": expire}, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+
+@lru_cache(maxsize=4096)
+def _decode_token(token: str) -> Tuple[Dict, float]:
+    """Verify a JWT signature once per distinct token, returning (payload, expires_at)
+
+    Raises jwt.InvalidTokenError; lru_cache does not cache exceptions, so only
+    valid tokens take up cache slots and a rejected token is checked afresh.
+    """
+    payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+    return payload, float(payload.get("exp", "inf"))
 
 def verify_token(token: str) -> Optional[Dict]:
-    """Verify JWT token (placeholder for demo)"""
-    # In production, this would decode and validate JWT
-    if token.startswith("demo_token_"):
-        return {"sub": "demo_user"}
-    return None
+    """Verify JWT token; repeat requests with the same bearer skip the HMAC check"""
+    try:
+        payload, expires_at = _decode_token(token)
+    except jwt.InvalidTokenError as e:
+        logger.debug(f"Rejected token: {e}")
+        return None
+
+    if time.time() >= expires_at:  # Expired since it was cached
+        return None
+    return dict(payload)  # Copy, so callers cannot alter the cached payload
@@ -23,7 +23,11 @@ from app.core.config import settings
 from app.core.database import init_db, close_db_connection
 from app.core.security import create_access_token, verify_token
 from app.api.v1.api import api_router
-from app.core.logger import setup_logging
+from app.api.v1.dflow_trading import close_dflow_client
+from app.services.kalshi_clob_service import close_kalshi_service
+from app.services.polymarket_clob_service import close_clob_service
+from app.services.clob_aggregate_service import close_aggregate_service
+from app.core.logger import setup_logging, stop_logging
 
 # Setup structured logging
 setup_logging()
@@ -35,6 +39,7 @@ security = HTTPBearer(auto_error=False)
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan events"""
+    setup_logging()  # No-op on first startup; restarts the queue after a previous shutdown
     logger.info("Starting MarketPulse Pro Backend API")
     
     # Startup
@@ -44,8 +49,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     yield
     
     # Shutdown
+    await close_dflow_client()
+    await close_aggregate_service()
+    await close_kalshi_service()
+    await close_clob_service()
     await close_db_connection()
     logger.info("Database connections closed")
+    stop_logging()
 
 # Create FastAPI application
 app = FastAPI(
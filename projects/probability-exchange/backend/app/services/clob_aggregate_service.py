@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+CLOB Aggregate Service
+
+Fetches Kalshi and Polymarket CLOB markets concurrently over the
+services' shared sessions
+"""
+
+import asyncio
+import logging
+from typing import List, Dict, Optional, Any
+
+from app.services.kalshi_clob_service import KalshiCLOBService, get_kalshi_service
+from app.services.polymarket_clob_service import PolymarketCLOBService, get_clob_service
+
+logger = logging.getLogger(__name__)
+
+
+class CLOBAggregateService:
+    """Service for fetching markets from both CLOB services at once"""
+
+    def __init__(self, kalshi: KalshiCLOBService, polymarket: PolymarketCLOBService):
+        self.kalshi = kalshi
+        self.polymarket = polymarket
+
+    async def fetch_all(
+        self,
+        limit: int = 100,
+        category: Optional[str] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch active markets from Kalshi and Polymarket in parallel
+
+        Args:
+            limit: Maximum number of markets per platform
+            category: Filter by category
+
+        Returns:
+            Markets keyed by platform; each service already serves stale data on upstream
+            failures, so a platform that still raises (e.g. no session) yields []
+        """
+        results = await asyncio.gather(
+            self.kalshi.fetch_markets(limit, True, category),
+            self.polymarket.fetch_markets(limit, True, category),
+            return_exceptions=True
+        )
+
+        markets: Dict[str, List[Dict[str, Any]]] = {}
+        for platform, result in zip(("kalshi", "polymarket"), results):
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching {platform} CLOB markets: {result}")
+                markets[platform] = []
+            else:
+                markets[platform] = result
+
+        return markets
+
+
+# Global service instance
+_aggregate_service: Optional[CLOBAggregateService] = None
+
+
+async def get_aggregate_service() -> CLOBAggregateService:
+    """Get or create the aggregate service over the shared CLOB services"""
+    global _aggregate_service
+    if _aggregate_service is None:
+        _aggregate_service = CLOBAggregateService(await get_kalshi_service(), await get_clob_service())
+    return _aggregate_service
+
+
+async def close_aggregate_service():
+    """Forget the aggregate on application shutdown; its CLOB services are closed by their own close functions"""
+    global _aggregate_service
+    _aggregate_service = None
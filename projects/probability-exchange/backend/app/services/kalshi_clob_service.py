@@ -8,8 +8,12 @@ Uses multiple endpoints with fallback support
 
 import aiohttp
 import asyncio
+import heapq
 import logging
-from typing import List, Dict, Optional, Any
+import orjson
+import random
+import time
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -21,6 +25,57 @@ KALSHI_ENDPOINTS = [
     "https://api.kalshi.com/trade-api/v2",            # Production API
 ]
 
+# Response cache lifetimes in seconds; stale entries are still served if Kalshi fails
+MARKETS_CACHE_TTL = 10.0
+MARKETS_CACHE_SIZE = 64
+MARKET_CACHE_TTL = 30.0
+MARKET_CACHE_SIZE = 1024
+
+# How long a probed endpoint is trusted, and when to start revalidating it in the background
+ENDPOINT_TTL = 300.0
+ENDPOINT_REFRESH_AFTER = 240.0
+
+# Response bodies larger than this are decoded in a worker thread
+JSON_THREAD_THRESHOLD = 512 * 1024
+
+_ETAG_CACHE_SIZE = 128  # Conditional-GET entries kept per service
+
+# 5xx responses and network errors are retried with jittered exponential backoff
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.25
+RETRY_MAX_DELAY = 2.0
+
+# Request timeouts, shared by every call
+_TIMEOUT_FETCH = aiohttp.ClientTimeout(total=15)
+_TIMEOUT_PROBE = aiohttp.ClientTimeout(total=5)
+_TIMEOUT_MARKET = aiohttp.ClientTimeout(total=10)
+
+
+def _volume_key(x: Dict[str, Any]):
+    """Sort key ranking markets by traded volume"""
+    return x.get("volume", 0) or 0
+
+
+async def _read_json(resp: aiohttp.ClientResponse) -> Any:
+    """Decode a response body with orjson, off the event loop for large payloads"""
+    body = await resp.read()
+    if len(body) > JSON_THREAD_THRESHOLD:
+        return await asyncio.to_thread(orjson.loads, body)
+    return orjson.loads(body)
+
+
+def _create_session() -> aiohttp.ClientSession:
+    """Create a keep-alive session pooled for repeated calls to the same hosts"""
+    connector = aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=30,
+        use_dns_cache=True,
+        ttl_dns_cache=300,
+        happy_eyeballs_delay=0.1,  # Fall back quickly when one address family stalls
+        keepalive_timeout=60,
+        enable_cleanup_closed=True
+    )
+    return aiohttp.ClientSession(connector=connector, headers={"User-Agent": "MarketPulsePro/1.0"})
 
 class KalshiCLOBService:
     """Service for fetching market data from Kalshi API"""
@@ -28,40 +83,169 @@ class KalshiCLOBService:
     def __init__(self):
         self.session: Optional[aiohttp.ClientSession] = None
         self.working_endpoint: Optional[str] = None
+        self._endpoint_lock = asyncio.Lock()
+        self._endpoint_checked_at = 0.0
+        self._endpoint_refresh: Optional[asyncio.Task] = None
+        # (limit, active_only, category) -> (fetched_at, markets)
+        self._markets_cache: Dict[Tuple[int, bool, Optional[str]], Tuple[float, List[Dict[str, Any]]]] = {}
+        self._inflight: Dict[Tuple[int, bool, Optional[str]], asyncio.Task] = {}
+        # ticker -> (fetched_at, market)
+        self._market_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # (url, params) -> (ETag, Last-Modified, decoded body) for conditional GETs
+        self._etag_cache: Dict[Tuple[str, Tuple], Tuple[Optional[str], Optional[str], Any]] = {}
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = _create_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
             await self.session.close()
 
-    async def _find_working_endpoint(self) -> Optional[str]:
-        """Try each endpoint to find one that works"""
-        if self.working_endpoint:
-            return self.working_endpoint
+    def _require_session(self):
+        """Fail loudly when used outside `async with` or get_kalshi_service()"""
+        if self.session is None:
+            raise RuntimeError("KalshiCLOBService has no session; use `async with` or get_kalshi_service()")
 
-        for endpoint in KALSHI_ENDPOINTS:
+    async def _get_json(
+        self,
+        url: str,
+        timeout: aiohttp.ClientTimeout,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, Any]:
+        """GET a JSON body, retrying 5xx responses and network errors with backoff"""
+        for attempt in range(RETRY_ATTEMPTS):
+            last_attempt = attempt == RETRY_ATTEMPTS - 1
             try:
-                async with self.session.get(
-                    f"{endpoint}/markets",
-                    params={"limit": 1},
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        if data.get("markets") or data.get("cursor"):
-                            self.working_endpoint = endpoint
-                            logger.info(f"Found working Kalshi endpoint: {endpoint}")
-                            return endpoint
-            except Exception as e:
-                logger.debug(f"Endpoint {endpoint} failed: {e}")
-                continue
+                status, data = await self._get_json_once(url, timeout, params)
+                if status < 500 or last_attempt:
+                    return status, data
+                logger.warning(f"Request to {url} returned {status} (attempt {attempt + 1})")
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                if last_attempt:
+                    raise
+                logger.warning(f"Request to {url} failed (attempt {attempt + 1}): {e}")
+
+            await asyncio.sleep(random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)))
+
+    async def _get_json_once(
+        self,
+        url: str,
+        timeout: aiohttp.ClientTimeout,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, Any]:
+        """GET a JSON body, revalidating with the last ETag/Last-Modified; a 304 replays the cached body"""
+        cache_key = (url, tuple(sorted(params.items())) if params else ())
+        cached = self._etag_cache.get(cache_key)
+        headers = {}
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        async with self.session.get(url, params=params, headers=headers, timeout=timeout) as resp:
+            if resp.status == 304 and cached:  # Unchanged; skip the download and the parse
+                return 200, cached[2]
+            if resp.status != 200:
+                return resp.status, None
+
+            data = await _read_json(resp)
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            if etag or last_modified:
+                if cache_key not in self._etag_cache and len(self._etag_cache) >= _ETAG_CACHE_SIZE:
+                    self._etag_cache.pop(next(iter(self._etag_cache)))  # Evict the oldest entry
+                self._etag_cache[cache_key] = (etag, last_modified, data)
+            return 200, data
+
+    async def _probe_endpoint(self, endpoint: str) -> bool:
+        """Check whether an endpoint answers a minimal markets query"""
+        try:
+            async with self.session.get(
+                f"{endpoint}/markets",
+                params={"limit": 1},
+                timeout=_TIMEOUT_PROBE
+            ) as resp:
+                if resp.status == 200:
+                    data = await _read_json(resp)
+                    return bool(data.get("markets") or data.get("cursor"))
+        except Exception as e:
+            logger.debug(f"Endpoint {endpoint} failed: {e}")
+        return False
 
+    async def _find_working_endpoint(self) -> Optional[str]:
+        """Return the working endpoint, re-probing once the cached choice is older than ENDPOINT_TTL"""
+        if self.working_endpoint:
+            age = time.monotonic() - self._endpoint_checked_at
+            if age < ENDPOINT_TTL:
+                if age > ENDPOINT_REFRESH_AFTER and self._endpoint_refresh is None:
+                    # Revalidate in the background so callers never wait on an expiring choice
+                    self._endpoint_refresh = asyncio.create_task(self._refresh_endpoint())
+                return self.working_endpoint
+
+        async with self._endpoint_lock:  # One probe round at a time; later callers reuse its result
+            if self.working_endpoint and time.monotonic() - self._endpoint_checked_at < ENDPOINT_TTL:
+                return self.working_endpoint
+            return await self._select_endpoint()
+
+    async def _refresh_endpoint(self):
+        """Re-probe the endpoints in the background ahead of ENDPOINT_TTL"""
+        try:
+            async with self._endpoint_lock:
+                await self._select_endpoint()
+        finally:
+            self._endpoint_refresh = None
+
+    async def _select_endpoint(self) -> Optional[str]:
+        """Probe all endpoints concurrently and pick the first working one in priority order"""
+        probes = [asyncio.create_task(self._probe_endpoint(endpoint)) for endpoint in KALSHI_ENDPOINTS]
+        try:
+            # Lower-priority probes keep running while a higher-priority one is awaited
+            for endpoint, probe in zip(KALSHI_ENDPOINTS, probes):
+                if await probe:
+                    self.working_endpoint = endpoint
+                    self._endpoint_checked_at = time.monotonic()
+                    logger.info(f"Found working Kalshi endpoint: {endpoint}")
+                    return endpoint
+        finally:
+            for probe in probes:
+                probe.cancel()
+
+        # Keep any previous choice; it is retried once its TTL runs out
         logger.warning("No working Kalshi endpoint found")
         return None
 
+    async def _get_with_failover(
+        self,
+        endpoint: str,
+        path: str,
+        timeout: aiohttp.ClientTimeout,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, Any]:
+        """GET a path from the working endpoint, moving to a newly probed endpoint if it keeps failing"""
+        result = error = None
+        try:
+            result = await self._get_json(endpoint + path, timeout, params)
+            if result[0] < 500:
+                return result
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            error = e
+
+        async with self._endpoint_lock:
+            if self.working_endpoint == endpoint:  # Another caller may already have moved on
+                await self._select_endpoint()
+
+        fallback = self.working_endpoint
+        if fallback and fallback != endpoint:
+            logger.warning(f"Failing over from Kalshi endpoint {endpoint} to {fallback}")
+            return await self._get_json(fallback + path, timeout, params)
+
+        if result is None:
+            raise error
+        return result
+
     async def fetch_markets(
         self,
         limit: int = 100,
@@ -71,6 +255,8 @@ class KalshiCLOBService:
         """
         Fetch markets from Kalshi API
 
+        Results are cached for MARKETS_CACHE_TTL seconds per argument set.
+
         Args:
             limit: Maximum number of markets to return
             active_only: Only return markets that are currently open/active
@@ -79,73 +265,126 @@ class KalshiCLOBService:
         Returns:
             List of market data dictionaries
         """
+        key = (limit, active_only, category)
+        cached = self._markets_cache.get(key)
+        now = time.monotonic()
+        if cached and now - cached[0] < MARKETS_CACHE_TTL:
+            return cached[1]
+
+        # Concurrent misses for the same key share one upstream request
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh_markets(key, limit, active_only, category))
+            self._inflight[key] = task
+        markets = await asyncio.shield(task)
+        if markets is None:
+            # Upstream failed; fall back to stale data rather than an empty page
+            return cached[1] if cached else []
+
+        return markets
+
+    async def _refresh_markets(
+        self,
+        key: Tuple[int, bool, Optional[str]],
+        limit: int,
+        active_only: bool,
+        category: Optional[str]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Fetch markets for one cache key and store them; awaited by every caller of that key"""
+        try:
+            markets = await self._fetch_markets(limit, active_only, category)
+            if markets is not None:
+                if key not in self._markets_cache and len(self._markets_cache) >= MARKETS_CACHE_SIZE:
+                    self._markets_cache.pop(next(iter(self._markets_cache)))  # Evict the oldest entry
+                self._markets_cache[key] = (time.monotonic(), markets)
+            return markets
+        finally:
+            del self._inflight[key]
+
+    async def _fetch_markets(
+        self,
+        limit: int,
+        active_only: bool,
+        category: Optional[str]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Fetch markets from Kalshi API, returning None if the request failed"""
+        self._require_session()
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
-
             endpoint = await self._find_working_endpoint()
             if not endpoint:
-                return []
+                return None
 
             params = {"limit": min(limit, 200)}
             if active_only:
                 params["status"] = "open"
 
-            async with self.session.get(
-                f"{endpoint}/markets",
-                params=params,
-                timeout=aiohttp.ClientTimeout(total=15)
-            ) as resp:
-                if resp.status != 200:
-                    logger.error(f"Kalshi API error: {resp.status}")
-                    return []
+            status, data = await self._get_with_failover(endpoint, "/markets", _TIMEOUT_FETCH, params)
+            if status != 200:
+                logger.error(f"Kalshi API error: {status}")
+                return None
 
-                data = await resp.json()
-                markets = data.get("markets", [])
+            markets = data.get("markets", [])
 
-                # Filter by category if specified
-                if category:
-                    markets = [m for m in markets if m.get("category", "").lower() == category.lower()]
+            # Filter by category if specified
+            if category:
+                cat_lower = category.lower()
+                markets = [m for m in markets if (cat := m.get("category")) and cat.lower() == cat_lower]
 
-                # Sort by volume
-                markets.sort(key=lambda x: x.get("volume", 0) or 0, reverse=True)
+            logger.info(f"Fetched {len(markets)} markets from Kalshi API")
 
-                logger.info(f"Fetched {len(markets)} markets from Kalshi API")
-                return markets[:limit]
+            # Top markets by volume without sorting the whole page
+            return heapq.nlargest(limit, markets, key=_volume_key)
 
         except asyncio.TimeoutError:
             logger.error("Kalshi API timeout")
-            return []
+            return None
         except Exception as e:
             logger.error(f"Error fetching markets from Kalshi: {e}")
-            return []
+            return None
 
     async def get_market_by_ticker(self, ticker: str) -> Optional[Dict[str, Any]]:
-        """Get a specific market by ticker"""
+        """Get a specific market by ticker, cached for MARKET_CACHE_TTL seconds"""
+        cached = self._market_cache.get(ticker)
+        now = time.monotonic()
+        if cached and now - cached[0] < MARKET_CACHE_TTL:
+            return cached[1]
+
+        market = await self._fetch_market_by_ticker(ticker)
+        if market is None:
+            return cached[1] if cached else None
+
+        if ticker not in self._market_cache and len(self._market_cache) >= MARKET_CACHE_SIZE:
+            self._market_cache.pop(next(iter(self._market_cache)))  # Evict the oldest entry
+        self._market_cache[ticker] = (now, market)
+        return market
+
+    async def _fetch_market_by_ticker(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """Fetch a specific market by ticker from Kalshi API"""
+        self._require_session()
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
-
             endpoint = await self._find_working_endpoint()
             if not endpoint:
                 return None
 
-            async with self.session.get(
-                f"{endpoint}/markets/{ticker}",
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as resp:
-                if resp.status != 200:
-                    return None
+            status, data = await self._get_with_failover(endpoint, f"/markets/{ticker}", _TIMEOUT_MARKET)
+            if status != 200:
+                return None
 
-                data = await resp.json()
-                return data.get("market") if isinstance(data, dict) else data
+            return data.get("market") if isinstance(data, dict) else data
 
         except Exception as e:
             logger.error(f"Error fetching market {ticker}: {e}")
             return None
 
-    def format_market_for_api(self, market: Dict[str, Any]) -> Dict[str, Any]:
-        """Convert Kalshi market format to standard API format"""
+    def format_market_for_api(
+        self,
+        market: Dict[str, Any],
+        last_updated: Optional[str] = None,
+        include_raw: bool = False
+    ) -> Dict[str, Any]:
+        """Convert Kalshi market format to standard API format; include_raw adds the upstream payload"""
+        ticker = market.get("ticker", "")
+
         # Kalshi uses 'yes' and 'no' outcomes typically
         outcomes = ["yes", "no"]
 
@@ -153,8 +392,8 @@ class KalshiCLOBService:
         yes_price = market.get("yes_price", 50) / 100.0  # Kalshi uses 0-100 scale
         probability = yes_price
 
-        return {
-            "id": market.get("ticker", ""),
+        formatted = {
+            "id": ticker,
             "platform": "kalshi",
             "question": market.get("title", ""),
             "description": market.get("description", ""),
@@ -167,15 +406,28 @@ class KalshiCLOBService:
             "total_volume": market.get("total_volume", 0) or 0,
             "liquidity": market.get("liquidity", 0) or 0,
             "status": market.get("status", "unknown"),
-            "url": f"https://kalshi.com/markets/{market.get('ticker', '')}",
+            "url": f"https://kalshi.com/markets/{ticker}",
             "open_time": market.get("open_time"),
             "close_time": market.get("close_time"),
-            "last_updated": datetime.utcnow().isoformat(),
+            "last_updated": last_updated or datetime.utcnow().isoformat(),
             "source": "kalshi_clob",
-            "raw_data": market,
-            "ticker": market.get("ticker", ""),
+            "ticker": ticker,
         }
 
+        # The upstream payload roughly doubles the response size, so it is opt-in
+        if include_raw:
+            formatted["raw_data"] = market
+        return formatted
+
+    def format_markets_for_api(
+        self,
+        markets: List[Dict[str, Any]],
+        include_raw: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Convert a page of Kalshi markets, stamping them with one shared timestamp"""
+        last_updated = datetime.utcnow().isoformat()
+        return [self.format_market_for_api(market, last_updated, include_raw) for market in markets]
+
 
 # Global service instance
 _kalshi_service: Optional[KalshiCLOBService] = None
@@ -186,4 +438,16 @@ async def get_kalshi_service() -> KalshiCLOBService:
     global _kalshi_service
     if _kalshi_service is None:
         _kalshi_service = KalshiCLOBService()
+        _kalshi_service.session = _create_session()  # Shared for the app's lifetime
     return _kalshi_service
+
+
+async def close_kalshi_service():
+    """Close the shared Kalshi service session on application shutdown"""
+    global _kalshi_service
+    if _kalshi_service is not None:
+        if _kalshi_service._endpoint_refresh:
+            _kalshi_service._endpoint_refresh.cancel()
+        if _kalshi_service.session:
+            await _kalshi_service.session.close()
+    _kalshi_service = None
@@ -8,8 +8,13 @@ No authentication required - read-only public data
 
 import aiohttp
 import asyncio
+import heapq
 import logging
-from typing import List, Dict, Optional, Any
+import orjson
+import random
+import time
+from operator import itemgetter
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -17,21 +22,148 @@ logger = logging.getLogger(__name__)
 # Polymarket CLOB API configuration
 CLOB_BASE_URL = "https://clob.polymarket.com"
 
+# Response cache lifetime in seconds; stale entries are still served if the CLOB API fails
+MARKETS_CACHE_TTL = 10.0
+MARKETS_CACHE_SIZE = 64
+SLUG_INDEX_TTL = 60.0
+
+# Response bodies larger than this are decoded in a worker thread
+JSON_THREAD_THRESHOLD = 512 * 1024
+
+_ETAG_CACHE_SIZE = 128  # Conditional-GET entries kept per service
+
+# 5xx responses and network errors are retried with jittered exponential backoff
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.25
+RETRY_MAX_DELAY = 2.0
+
+# Request timeouts, shared by every call
+_TIMEOUT_FETCH = aiohttp.ClientTimeout(total=15)
+_TIMEOUT_MARKET = aiohttp.ClientTimeout(total=10)
+
+
+def _volume_key(x: Dict[str, Any]):
+    """Sort key ranking markets by traded volume"""
+    return float(x.get("volume", 0) or 0)
+
+
+def _passes(market: Dict[str, Any], active_only: bool, cat_lower: Optional[str]) -> bool:
+    """Whether a market survives the active/category filters"""
+    # Skip closed/resolved markets if active_only
+    if active_only and (
+        market.get("closed", False)
+        or not market.get("accepting_orders", False)
+        or market.get("archived", False)
+    ):
+        return False
+
+    # Skip if category specified and doesn't match
+    if cat_lower is None:
+        return True
+    return bool((cat := market.get("category")) and cat.lower() == cat_lower)
+
+
+async def _read_json(resp: aiohttp.ClientResponse) -> Any:
+    """Decode a response body with orjson, off the event loop for large payloads"""
+    body = await resp.read()
+    if len(body) > JSON_THREAD_THRESHOLD:
+        return await asyncio.to_thread(orjson.loads, body)
+    return orjson.loads(body)
+
+
+def _create_session() -> aiohttp.ClientSession:
+    """Create a keep-alive session pooled for repeated calls to the same hosts"""
+    connector = aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=30,
+        use_dns_cache=True,
+        ttl_dns_cache=300,
+        happy_eyeballs_delay=0.1,  # Fall back quickly when one address family stalls
+        keepalive_timeout=60,
+        enable_cleanup_closed=True
+    )
+    return aiohttp.ClientSession(connector=connector, headers={"User-Agent": "MarketPulsePro/1.0"})
 
 class PolymarketCLOBService:
     """Service for fetching market data from Polymarket CLOB API"""
 
     def __init__(self):
         self.session: Optional[aiohttp.ClientSession] = None
+        # (limit, active_only, category) -> (fetched_at, markets)
+        self._markets_cache: Dict[Tuple[int, bool, Optional[str]], Tuple[float, List[Dict[str, Any]]]] = {}
+        self._inflight: Dict[Tuple[int, bool, Optional[str]], asyncio.Task] = {}
+        # market_slug -> market, rebuilt from every full market list download
+        self._slug_index: Dict[str, Dict[str, Any]] = {}
+        self._slug_index_at = 0.0
+        # (url, params) -> (ETag, Last-Modified, decoded body) for conditional GETs
+        self._etag_cache: Dict[Tuple[str, Tuple], Tuple[Optional[str], Optional[str], Any]] = {}
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = _create_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
             await self.session.close()
 
+    def _require_session(self):
+        """Fail loudly when used outside `async with` or get_clob_service()"""
+        if self.session is None:
+            raise RuntimeError("PolymarketCLOBService has no session; use `async with` or get_clob_service()")
+
+    async def _get_json(
+        self,
+        url: str,
+        timeout: aiohttp.ClientTimeout,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, Any]:
+        """GET a JSON body, retrying 5xx responses and network errors with backoff"""
+        for attempt in range(RETRY_ATTEMPTS):
+            last_attempt = attempt == RETRY_ATTEMPTS - 1
+            try:
+                status, data = await self._get_json_once(url, timeout, params)
+                if status < 500 or last_attempt:
+                    return status, data
+                logger.warning(f"Request to {url} returned {status} (attempt {attempt + 1})")
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                if last_attempt:
+                    raise
+                logger.warning(f"Request to {url} failed (attempt {attempt + 1}): {e}")
+
+            await asyncio.sleep(random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)))
+
+    async def _get_json_once(
+        self,
+        url: str,
+        timeout: aiohttp.ClientTimeout,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, Any]:
+        """GET a JSON body, revalidating with the last ETag/Last-Modified; a 304 replays the cached body"""
+        cache_key = (url, tuple(sorted(params.items())) if params else ())
+        cached = self._etag_cache.get(cache_key)
+        headers = {}
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        async with self.session.get(url, params=params, headers=headers, timeout=timeout) as resp:
+            if resp.status == 304 and cached:  # Unchanged; skip the download and the parse
+                return 200, cached[2]
+            if resp.status != 200:
+                return resp.status, None
+
+            data = await _read_json(resp)
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            if etag or last_modified:
+                if cache_key not in self._etag_cache and len(self._etag_cache) >= _ETAG_CACHE_SIZE:
+                    self._etag_cache.pop(next(iter(self._etag_cache)))  # Evict the oldest entry
+                self._etag_cache[cache_key] = (etag, last_modified, data)
+            return 200, data
+
     async def fetch_markets(
         self,
         limit: int = 100,
@@ -46,83 +178,114 @@ class PolymarketCLOBService:
             active_only: Only return markets that are currently accepting orders (default True)
             category: Filter by category (e.g., 'Politics', 'Crypto', 'Sports')
 
+        Results are cached for MARKETS_CACHE_TTL seconds per argument set.
+
         Returns:
             List of market data dictionaries sorted by volume (highest first)
         """
+        key = (limit, active_only, category)
+        cached = self._markets_cache.get(key)
+        now = time.monotonic()
+        if cached and now - cached[0] < MARKETS_CACHE_TTL:
+            return cached[1]
+
+        # Concurrent misses for the same key share one upstream request
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh_markets(key, limit, active_only, category))
+            self._inflight[key] = task
+        markets = await asyncio.shield(task)
+        if markets is None:
+            # Upstream failed; fall back to stale data rather than an empty page
+            return cached[1] if cached else []
+
+        return markets
+
+    async def _refresh_markets(
+        self,
+        key: Tuple[int, bool, Optional[str]],
+        limit: int,
+        active_only: bool,
+        category: Optional[str]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Fetch markets for one cache key and store them; awaited by every caller of that key"""
+        try:
+            markets = await self._fetch_markets(limit, active_only, category)
+            if markets is not None:
+                if key not in self._markets_cache and len(self._markets_cache) >= MARKETS_CACHE_SIZE:
+                    self._markets_cache.pop(next(iter(self._markets_cache)))  # Evict the oldest entry
+                self._markets_cache[key] = (time.monotonic(), markets)
+            return markets
+        finally:
+            del self._inflight[key]
+
+    async def _fetch_markets(
+        self,
+        limit: int,
+        active_only: bool,
+        category: Optional[str]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Fetch markets from Polymarket CLOB API, returning None if the request failed"""
+        self._require_session()
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
-
-            async with self.session.get(f"{CLOB_BASE_URL}/markets", timeout=aiohttp.ClientTimeout(total=15)) as resp:
-                if resp.status != 200:
-                    logger.error(f"CLOB API error: {resp.status}")
-                    return []
-
-                data = await resp.json()
-                markets = data if isinstance(data, list) else data.get("data", [])
-
-                # Filter markets
-                filtered_markets = []
-                for market in markets:
-                    # Skip closed/resolved markets if active_only
-                    if active_only:
-                        if market.get("closed", False):
-                            continue
-                        if not market.get("accepting_orders", False):
-                            continue
-                        if market.get("archived", False):
-                            continue
-
-                    # Skip if category specified and doesn't match
-                    if category and market.get("category", "").lower() != category.lower():
-                        continue
-
-                    filtered_markets.append(market)
-
-                # Sort by volume (highest first) to get most active markets
-                filtered_markets.sort(
-                    key=lambda x: float(x.get("volume", 0) or 0),
-                    reverse=True
-                )
-
-                # Apply limit after sorting
-                result = filtered_markets[:limit]
-
-                logger.info(f"Fetched {len(result)} active markets from CLOB API (filtered from {len(markets)} total)")
-                return result
+            status, data = await self._get_json(f"{CLOB_BASE_URL}/markets", _TIMEOUT_FETCH)
+            if status != 200:
+                logger.error(f"CLOB API error: {status}")
+                return None
+
+            markets = data if isinstance(data, list) else data.get("data", [])
+            self._index_slugs(markets)
+
+            # Filter and extract volume in one pass; only the top `limit` are ordered
+            cat_lower = category.lower() if category else None
+            pairs = ((_volume_key(m), m) for m in markets if _passes(m, active_only, cat_lower))
+            result = [m for _, m in heapq.nlargest(limit, pairs, key=itemgetter(0))]
+
+            logger.info(f"Fetched {len(result)} active markets from CLOB API (filtered from {len(markets)} total)")
+            return result
 
         except asyncio.TimeoutError:
             logger.error("CLOB API timeout")
-            return []
+            return None
         except Exception as e:
             logger.error(f"Error fetching markets from CLOB: {e}")
-            return []
+            return None
+
+    def _index_slugs(self, markets: List[Dict[str, Any]]):
+        """Rebuild the slug index from a full market list"""
+        self._slug_index = {slug: m for m in markets if (slug := m.get("market_slug"))}
+        self._slug_index_at = time.monotonic()
 
     async def get_market_by_slug(self, slug: str) -> Optional[Dict[str, Any]]:
-        """Get a specific market by slug"""
+        """Get a specific market by slug, served from the slug index while it is fresh"""
+        if time.monotonic() - self._slug_index_at < SLUG_INDEX_TTL:
+            market = self._slug_index.get(slug)
+            if market is not None:
+                return market
+
+        # The CLOB API only addresses markets by condition id, so a miss re-downloads the list
+        self._require_session()
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
-
-            async with self.session.get(f"{CLOB_BASE_URL}/markets", timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                if resp.status != 200:
-                    return None
-
-                data = await resp.json()
-                markets = data.get("data", []) if isinstance(data, dict) else data
-
-                for market in markets:
-                    if market.get("market_slug") == slug:
-                        return market
-
+            status, data = await self._get_json(f"{CLOB_BASE_URL}/markets", _TIMEOUT_MARKET)
+            if status != 200:
                 return None
 
+            markets = data.get("data", []) if isinstance(data, dict) else data
+            self._index_slugs(markets)
+            return self._slug_index.get(slug)
+
         except Exception as e:
             logger.error(f"Error fetching market {slug}: {e}")
             return None
 
-    def format_market_for_api(self, market: Dict[str, Any]) -> Dict[str, Any]:
-        """Convert CLOB market format to standard API format"""
+    def format_market_for_api(
+        self,
+        market: Dict[str, Any],
+        last_updated: Optional[str] = None,
+        include_raw: bool = False
+    ) -> Dict[str, Any]:
+        """Convert CLOB market format to standard API format; include_raw adds the upstream payload"""
+        slug = market.get("market_slug", "")
         tokens = market.get("tokens", [])
         outcomes = [t.get("outcome", "Unknown") for t in tokens]
         prices = [t.get("price", 0) for t in tokens]
@@ -130,7 +293,7 @@ class PolymarketCLOBService:
         # Calculate probability from first outcome (Yes/No binary market)
         probability = prices[0] if prices else 0.5
 
-        return {
+        formatted = {
             "id": market.get("condition_id", market.get("question_id", "")),
             "platform": "polymarket",
             "question": market.get("question", ""),
@@ -144,16 +307,29 @@ class PolymarketCLOBService:
             "total_volume": market.get("volume", 0) or 0,
             "liquidity": market.get("liquidity", 0) or 0,
             "status": "resolved" if market.get("closed") else "open",
-            "url": f"https://polymarket.com/market/{market.get('market_slug', '')}",
+            "url": f"https://polymarket.com/market/{slug}",
             "open_time": market.get("createdAt"),
             "close_time": market.get("endDate"),
-            "last_updated": datetime.utcnow().isoformat(),
+            "last_updated": last_updated or datetime.utcnow().isoformat(),
             "source": "polymarket_clob",
-            "raw_data": market,
             "accepting_orders": market.get("accepting_orders", False),
-            "market_slug": market.get("market_slug", ""),
+            "market_slug": slug,
         }
 
+        # The upstream payload roughly doubles the response size, so it is opt-in
+        if include_raw:
+            formatted["raw_data"] = market
+        return formatted
+
+    def format_markets_for_api(
+        self,
+        markets: List[Dict[str, Any]],
+        include_raw: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Convert a page of CLOB markets, stamping them with one shared timestamp"""
+        last_updated = datetime.utcnow().isoformat()
+        return [self.format_market_for_api(market, last_updated, include_raw) for market in markets]
+
 
 # Global service instance
 _clob_service: Optional[PolymarketCLOBService] = None
@@ -164,4 +340,13 @@ async def get_clob_service() -> PolymarketCLOBService:
     global _clob_service
     if _clob_service is None:
         _clob_service = PolymarketCLOBService()
+        _clob_service.session = _create_session()  # Shared for the app's lifetime
     return _clob_service
+
+
+async def close_clob_service():
+    """Close the shared CLOB service session on application shutdown"""
+    global _clob_service
+    if _clob_service is not None and _clob_service.session:
+        await _clob_service.session.close()
+    _clob_service = None
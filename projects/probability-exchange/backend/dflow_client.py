@@ -16,17 +16,39 @@ References:
 import asyncio
 import aiohttp
 import logging
-from typing import Dict, List, Optional, Any
+import orjson
+import random
+import time
+from aiolimiter import AsyncLimiter
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from datetime import datetime
-from urllib.parse import urljoin
+from functools import lru_cache
 from decimal import Decimal
 
-logging.basicConfig(level=logging.INFO)
+# Handlers are configured by the application entrypoint, or below when run as a script
 logger = logging.getLogger(__name__)
 
+# Response cache lifetimes in seconds for idempotent GETs
+TOKENS_CACHE_TTL = 300.0
+VENUES_CACHE_TTL = 300.0
+MARKET_DETAIL_CACHE_TTL = 5.0
+RESPONSE_CACHE_SIZE = 1024
+RETRY_MAX_DELAY = 30.0  # Cap on the jittered retry backoff, in seconds
 
-@dataclass
+
+def _json_dumps(obj: Any) -> str:
+    """Encode request bodies with orjson instead of the stdlib json module"""
+    return orjson.dumps(obj).decode()
+
+
+async def _read_json(response: aiohttp.ClientResponse) -> Any:
+    """Decode a response body with orjson instead of aiohttp's stdlib json"""
+    body = await response.read()
+    return orjson.loads(body) if body else None
+
+
+@dataclass(slots=True)
 class DFlowConfig:
     """Configuration for DFlow API client"""
     api_key: Optional[str] = None
@@ -35,6 +57,9 @@ class DFlowConfig:
     retry_attempts: int = 3
     retry_delay: float = 1.0
     rate_limit: int = 100
+    connector_limit: int = 100
+    keepalive_timeout: int = 60
+    max_inflight: int = 10
 
 
 @dataclass
@@ -63,6 +88,107 @@ class MarketPosition:
     platform: str = "dflow"
 
 
+_MS_TIMESTAMP_THRESHOLD = 10_000_000_000  # Larger Unix timestamps are in milliseconds
+
+
+def _parse_unix_timestamp(timestamp: float) -> datetime:
+    """Parse a Unix timestamp in seconds or milliseconds"""
+    return datetime.fromtimestamp(timestamp / 1000 if timestamp > _MS_TIMESTAMP_THRESHOLD else timestamp)
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_timestamp(timestamp: str) -> datetime:
+    """Parse an ISO 8601 string; memoized as dates repeat across markets and polls"""
+    return datetime.fromisoformat(timestamp)  # 3.11+ accepts a trailing 'Z'
+
+
+# Exact-type dispatch for DFlowAPIClient._parse_timestamp
+_TIMESTAMP_PARSERS = {int: _parse_unix_timestamp, float: _parse_unix_timestamp, str: _parse_iso_timestamp}
+
+
+def _to_bps(fraction: float) -> int:
+    """Convert a slippage fraction to basis points (0.01 -> 100)"""
+    # round, not int: 0.0029 * 10000 is 28.999... and would truncate to 28
+    return round(fraction * 10000)
+
+
+_BINARY_OUTCOMES = ('Yes', 'No')  # Kalshi markets are binary; shared by every DFlowMarket
+
+
+@dataclass(slots=True)
+class DFlowMarket:
+    """Tokenized Kalshi prediction market listed on DFlow"""
+    id: Optional[str]
+    question: str
+    description: Optional[str]
+    category: Optional[str]
+    yes_token_mint: Optional[str]
+    no_token_mint: Optional[str]
+    yes_price: float
+    no_price: float
+    probability: float
+    volume_24h: float
+    total_volume: float
+    liquidity: float
+    open_time: Optional[datetime]
+    close_time: Optional[datetime]
+    resolution_date: Optional[datetime]
+    status: str
+    is_settled: bool
+    url: Optional[str]
+    kalshi_url: Optional[str]
+    last_updated: datetime
+    platform: str = "dflow"
+    chain: str = "solana"
+    market_type: str = "BINARY"
+    outcomes: tuple = _BINARY_OUTCOMES
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any], now: datetime) -> "DFlowMarket":
+        """Build from a DFlow market-list item, skipping the generated __init__"""
+        get = data.get
+        parse = DFlowAPIClient._parse_timestamp
+        market = object.__new__(cls)
+        market.id = get('id')
+        market.platform = 'dflow'
+        market.chain = 'solana'
+        market.question = get('title', '')
+        market.description = get('description')
+        market.category = get('category')
+        market.market_type = 'BINARY'
+        market.outcomes = _BINARY_OUTCOMES
+
+        # Token information
+        market.yes_token_mint = get('yesTokenMint')
+        market.no_token_mint = get('noTokenMint')
+
+        # Pricing
+        market.yes_price = float(get('yesPrice', 0))
+        market.no_price = float(get('noPrice', 0))
+        market.probability = float(get('probability', 0))
+
+        # Volume and liquidity
+        market.volume_24h = float(get('volume24h', 0))
+        market.total_volume = float(get('totalVolume', 0))
+        market.liquidity = float(get('liquidity', 0))
+
+        # Dates
+        market.open_time = parse(get('openTime'))
+        market.close_time = parse(get('closeTime'))
+        market.resolution_date = parse(get('resolutionTime'))
+
+        # Status
+        market.status = get('status', 'open')
+        market.is_settled = get('isSettled', False)
+
+        # Links
+        market.url = get('url')
+        market.kalshi_url = get('kalshiUrl')
+
+        market.last_updated = now
+        return market
+
+
 class DFlowAPIClient:
     """
     DFlow API Client for Solana-based prediction market trading
@@ -73,22 +199,45 @@ class DFlowAPIClient:
 
     def __init__(self, config: DFlowConfig):
         self.config = config
-        self.base_url = config.base_url
+        self.base_url = config.base_url.rstrip('/')
         self.session: Optional[aiohttp.ClientSession] = None
-        self.rate_limit_bucket = asyncio.Semaphore(config.rate_limit // 60)
+        self._owns_session = False
+        self.rate_limit_bucket = AsyncLimiter(config.rate_limit, 60)  # Requests per minute
+        self._bulk_inflight = asyncio.Semaphore(config.max_inflight)  # Caps bulk fan-out
+        # endpoint -> (fetched_at, decoded body) for cached GETs
+        self._response_cache: Dict[str, Tuple[float, Any]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Sent per request so a shared session needs no DFlow-specific defaults
+        self._headers = self._get_headers()
+        self._timeout = aiohttp.ClientTimeout(total=config.timeout)
+
+    @classmethod
+    def from_shared(cls, config: DFlowConfig, session: aiohttp.ClientSession) -> "DFlowAPIClient":
+        """Create a client on an existing session so several clients share one connection pool"""
+        client = cls(config)
+        client.session = session
+        return client
 
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.config.timeout),
-            headers=self._get_headers()
-        )
+        if self.session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.connector_limit,
+                ttl_dns_cache=300,
+                keepalive_timeout=self.config.keepalive_timeout,
+                enable_cleanup_closed=True
+            )
+            self.session = aiohttp.ClientSession(connector=connector, json_serialize=_json_dumps)
+            self._owns_session = True
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
+        """Async context manager exit; a shared session is left to its owner"""
+        if self.session and self._owns_session:
             await self.session.close()
+            # Let the next `async with` build a fresh session
+            self.session = None
+            self._owns_session = False
 
     def _get_headers(self) -> Dict[str, str]:
         """Get default headers for DFlow API"""
@@ -104,6 +253,38 @@ class DFlowAPIClient:
 
         return headers
 
+    def set_rate_limit(self, rate_limit: int):
+        """Change the requests-per-minute budget at runtime, e.g. when DFlow announces a new quota"""
+        # Callers already waiting finish on the old limiter; new requests use the new rate.
+        # The config is left alone because create_dflow_config() shares one instance.
+        self.rate_limit_bucket = AsyncLimiter(rate_limit, 60)
+
+    def _drain_rate_limit(self, retry_after: float):
+        """Overfill the limiter so all callers wait out a 429 together, then resume at the steady rate"""
+        bucket = self.rate_limit_bucket
+        bucket.has_capacity()  # Leak up to now before overfilling
+        # aiolimiter has no public drain (pinned to 1.3.0); the next slot frees up after retry_after
+        overfill = bucket.max_rate - 1 + retry_after * bucket.max_rate / bucket.time_period
+        bucket._level = max(bucket._level, overfill)
+
+    async def _send_request(self, method: str, url: str, **kwargs) -> Tuple[Optional[int], Any]:
+        """Send one request without rate limiting; returns (Retry-After, None) on a 429, else (None, body)"""
+        async with self.session.request(
+                method, url, headers=self._headers, timeout=self._timeout, **kwargs) as response:
+            # Handle rate limiting
+            if response.status == 429:
+                return int(response.headers.get('Retry-After', 60)), None
+
+            # Handle errors
+            if response.status >= 400:
+                error_text = await response.text()
+                logger.error(f"DFlow API Error {response.status}: {error_text}")
+                raise aiohttp.ClientError(
+                    f"DFlow API Error {response.status}: {error_text}"
+                )
+
+            return None, await _read_json(response)
+
     async def _rate_limited_request(
         self,
         method: str,
@@ -111,35 +292,54 @@ class DFlowAPIClient:
         **kwargs
     ) -> Dict[str, Any]:
         """Make a rate-limited API request with retry logic"""
-        async with self.rate_limit_bucket:
-            for attempt in range(self.config.retry_attempts):
-                try:
-                    url = urljoin(self.base_url, endpoint)
-
-                    async with self.session.request(method, url, **kwargs) as response:
-                        # Handle rate limiting
-                        if response.status == 429:
-                            retry_after = int(response.headers.get('Retry-After', 60))
-                            logger.warning(f"DFlow rate limit exceeded, waiting {retry_after}s")
-                            await asyncio.sleep(retry_after)
-                            continue
-
-                        # Handle errors
-                        if response.status >= 400:
-                            error_text = await response.text()
-                            logger.error(f"DFlow API Error {response.status}: {error_text}")
-                            raise aiohttp.ClientError(
-                                f"DFlow API Error {response.status}: {error_text}"
-                            )
-
-                        return await response.json()
-
-                except aiohttp.ClientError as e:
-                    if attempt == self.config.retry_attempts - 1:
-                        raise
-
-                    logger.warning(f"DFlow request failed (attempt {attempt + 1}): {e}")
-                    await asyncio.sleep(self.config.retry_delay * (2 ** attempt))
+        url = self.base_url + endpoint  # Endpoints start with '/'
+        for attempt in range(self.config.retry_attempts):
+            try:
+                # Take a limiter slot right before dispatch; nothing is held while backing off
+                await self.rate_limit_bucket.acquire()
+                retry_after, data = await self._send_request(method, url, **kwargs)
+            except aiohttp.ClientError as e:
+                if attempt == self.config.retry_attempts - 1:
+                    raise
+
+                logger.warning(f"DFlow request failed (attempt {attempt + 1}): {e}")
+                # Full jitter spreads concurrent retries across the backoff window
+                backoff = min(RETRY_MAX_DELAY, self.config.retry_delay * (2 ** attempt))
+                await asyncio.sleep(random.uniform(0, backoff))
+                continue
+
+            if retry_after is None:
+                return data
+
+            logger.warning(f"DFlow rate limit exceeded, waiting {retry_after}s")
+            self._drain_rate_limit(retry_after)
+
+        raise aiohttp.ClientError(f"DFlow rate limit exceeded after {self.config.retry_attempts} attempts")
+
+    async def _cached_get(self, endpoint: str, ttl: float) -> Any:
+        """GET an endpoint through the response cache; concurrent misses share one request"""
+        cached = self._response_cache.get(endpoint)
+        if cached and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+
+        task = self._inflight.get(endpoint)
+        if task is None:
+            task = asyncio.create_task(self._refresh_cached(endpoint))
+            self._inflight[endpoint] = task
+        return await asyncio.shield(task)
+
+    async def _refresh_cached(self, endpoint: str) -> Any:
+        """Fetch an endpoint and store the body; failures and empty bodies propagate uncached"""
+        try:
+            response = await self._rate_limited_request('GET', endpoint)
+            if response is None:  # Empty body; nothing worth pinning for the TTL
+                return response
+            if endpoint not in self._response_cache and len(self._response_cache) >= RESPONSE_CACHE_SIZE:
+                self._response_cache.pop(next(iter(self._response_cache)))  # Evict the oldest entry
+            self._response_cache[endpoint] = (time.monotonic(), response)
+            return response
+        finally:
+            del self._inflight[endpoint]
 
     # ============================================================================
     # Prediction Market Discovery
@@ -149,7 +349,7 @@ class DFlowAPIClient:
         self,
         category: Optional[str] = None,
         limit: int = 100
-    ) -> List[Dict[str, Any]]:
+    ) -> List["DFlowMarket"]:
         """
         Get available tokenized prediction markets from DFlow
 
@@ -160,7 +360,7 @@ class DFlowAPIClient:
             limit: Maximum number of markets to return
 
         Returns:
-            List of prediction market data
+            List of DFlowMarket objects
         """
         try:
             params = {'limit': min(limit, 200)}
@@ -176,50 +376,12 @@ class DFlowAPIClient:
 
             markets = response.get('markets', [])
 
-            # Transform to consistent format
+            # Transform to consistent format; one timestamp covers the whole response
+            now = datetime.utcnow()
             transformed_markets = []
             for market in markets:
                 try:
-                    transformed_market = {
-                        'id': market.get('id'),
-                        'platform': 'dflow',
-                        'chain': 'solana',
-                        'question': market.get('title', ''),
-                        'description': market.get('description'),
-                        'category': market.get('category'),
-                        'market_type': 'BINARY',  # Kalshi markets are binary
-                        'outcomes': ['Yes', 'No'],
-
-                        # Token information
-                        'yes_token_mint': market.get('yesTokenMint'),
-                        'no_token_mint': market.get('noTokenMint'),
-
-                        # Pricing
-                        'yes_price': float(market.get('yesPrice', 0)),
-                        'no_price': float(market.get('noPrice', 0)),
-                        'probability': float(market.get('probability', 0)),
-
-                        # Volume and liquidity
-                        'volume_24h': float(market.get('volume24h', 0)),
-                        'total_volume': float(market.get('totalVolume', 0)),
-                        'liquidity': float(market.get('liquidity', 0)),
-
-                        # Dates
-                        'open_time': self._parse_timestamp(market.get('openTime')),
-                        'close_time': self._parse_timestamp(market.get('closeTime')),
-                        'resolution_date': self._parse_timestamp(market.get('resolutionTime')),
-
-                        # Status
-                        'status': market.get('status', 'open'),
-                        'is_settled': market.get('isSettled', False),
-
-                        # Links
-                        'url': market.get('url'),
-                        'kalshi_url': market.get('kalshiUrl'),
-
-                        'last_updated': datetime.utcnow()
-                    }
-                    transformed_markets.append(transformed_market)
+                    transformed_markets.append(DFlowMarket.from_api(market, now))
                 except Exception as e:
                     logger.error(f"Error transforming DFlow market: {e}")
                     continue
@@ -231,21 +393,23 @@ class DFlowAPIClient:
             logger.error(f"Failed to fetch DFlow prediction markets: {e}")
             return []
 
-    async def get_market_detail(self, market_id: str) -> Optional[Dict[str, Any]]:
+    async def get_market_detail(
+        self,
+        market_id: str,
+        now: Optional[datetime] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Get detailed information about a specific prediction market
 
         Args:
             market_id: The market identifier
+            now: Timestamp for last_updated; batch callers pass one shared value
 
         Returns:
             Market detail data
         """
         try:
-            response = await self._rate_limited_request(
-                'GET',
-                f'/prediction-markets/{market_id}'
-            )
+            response = await self._cached_get(f'/prediction-markets/{market_id}', MARKET_DETAIL_CACHE_TTL)
 
             market = response.get('market', response)
 
@@ -266,13 +430,35 @@ class DFlowAPIClient:
                 'liquidity': float(market.get('liquidity', 0)),
                 'status': market.get('status', 'open'),
                 'url': market.get('url'),
-                'last_updated': datetime.utcnow()
+                'last_updated': now or datetime.utcnow()
             }
 
         except Exception as e:
             logger.error(f"Failed to fetch DFlow market {market_id}: {e}")
             return None
 
+    async def get_market_details_bulk(self, market_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get details for several prediction markets concurrently
+
+        Requests still pass through the rate limiter; at most config.max_inflight
+        are in flight at once.
+
+        Args:
+            market_ids: The market identifiers
+
+        Returns:
+            Market detail data in input order, None for markets that failed
+        """
+        now = datetime.utcnow()
+
+        async def fetch(market_id: str) -> Optional[Dict[str, Any]]:
+            async with self._bulk_inflight:
+                return await self.get_market_detail(market_id, now)
+
+        results = await asyncio.gather(*(fetch(market_id) for market_id in market_ids), return_exceptions=True)
+        return [None if isinstance(result, Exception) else result for result in results]
+
     # ============================================================================
     # Trading - Swap API
     # ============================================================================
@@ -301,7 +487,7 @@ class DFlowAPIClient:
                 'inputMint': input_token,
                 'outputMint': output_token,
                 'amount': amount,
-                'slippageBps': int(slippage_tolerance * 10000)  # Convert to basis points
+                'slippageBps': _to_bps(slippage_tolerance)
             }
 
             response = await self._rate_limited_request(
@@ -348,7 +534,7 @@ class DFlowAPIClient:
                 'outputMint': quote.out_token,
                 'amount': quote.in_amount,
                 'userPublicKey': user_public_key,
-                'slippageBps': int(quote.estimated_slippage * 10000)
+                'slippageBps': _to_bps(quote.estimated_slippage)
             }
 
             if priority_fee:
@@ -401,7 +587,7 @@ class DFlowAPIClient:
                 'outputMint': output_token,
                 'amount': amount,
                 'userPublicKey': user_public_key,
-                'slippageBps': int(slippage_tolerance * 10000)
+                'slippageBps': _to_bps(slippage_tolerance)
             }
 
             response = await self._rate_limited_request(
@@ -471,7 +657,7 @@ class DFlowAPIClient:
         try:
             endpoint = '/tokens-with-decimals' if include_decimals else '/tokens'
 
-            response = await self._rate_limited_request('GET', endpoint)
+            response = await self._cached_get(endpoint, TOKENS_CACHE_TTL)
 
             return response.get('tokens', [])
 
@@ -487,7 +673,7 @@ class DFlowAPIClient:
             List of trading venues
         """
         try:
-            response = await self._rate_limited_request('GET', '/venues')
+            response = await self._cached_get('/venues', VENUES_CACHE_TTL)
 
             return response.get('venues', [])
 
@@ -580,27 +766,18 @@ class DFlowAPIClient:
     # Utility Methods
     # ============================================================================
 
-    def _parse_timestamp(self, timestamp: Optional[Any]) -> Optional[datetime]:
+    @staticmethod
+    def _parse_timestamp(timestamp: Optional[Any]) -> Optional[datetime]:
         """Parse timestamp from API response"""
         if not timestamp:
             return None
 
-        try:
-            # Handle Unix timestamp (milliseconds or seconds)
-            if isinstance(timestamp, (int, float)):
-                # If timestamp is too large, it's likely in milliseconds
-                if timestamp > 10000000000:
-                    timestamp = timestamp / 1000
-                return datetime.fromtimestamp(timestamp)
-
-            # Handle ISO string
-            if isinstance(timestamp, str):
-                if timestamp.endswith('Z'):
-                    timestamp = timestamp[:-1] + '+00:00'
-                return datetime.fromisoformat(timestamp)
-
+        parse = _TIMESTAMP_PARSERS.get(type(timestamp))
+        if parse is None:
             return None
 
+        try:
+            return parse(timestamp)
         except Exception as e:
             logger.warning(f"Failed to parse timestamp {timestamp}: {e}")
             return None
@@ -618,8 +795,9 @@ class DFlowAPIClient:
 # Configuration Helper
 # ============================================================================
 
+@lru_cache(maxsize=1)
 def create_dflow_config() -> Optional[DFlowConfig]:
-    """Create DFlow configuration from environment variables"""
+    """Create DFlow configuration from environment variables (cached; see cache_clear())"""
     import os
 
     api_key = os.getenv('DFLOW_API_KEY')
@@ -657,9 +835,9 @@ async def test_dflow_client():
 
         if markets:
             sample = markets[0]
-            print(f"   Sample: {sample['question'][:60]}...")
-            print(f"   YES Price: ${sample.get('yes_price', 'N/A')}")
-            print(f"   NO Price: ${sample.get('no_price', 'N/A')}")
+            print(f"   Sample: {sample.question[:60]}...")
+            print(f"   YES Price: ${sample.yes_price}")
+            print(f"   NO Price: ${sample.no_price}")
 
         # Test token listing
         print("\n3. Testing token listing...")
@@ -675,4 +853,5 @@ async def test_dflow_client():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(test_dflow_client())
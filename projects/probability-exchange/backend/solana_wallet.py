@@ -175,12 +175,13 @@ class SolanaWalletManager:
             Session ID
         """
         session_id = secrets.token_urlsafe(32)
+        now = datetime.utcnow()
 
         session_data = {
             'wallet_address': wallet_address,
             'wallet_type': 'solana',
-            'created_at': datetime.utcnow(),
-            'expires_at': datetime.utcnow() + timedelta(hours=expires_hours),
+            'created_at': now,
+            'expires_at': now + timedelta(hours=expires_hours),
             'is_active': True
         }
 
@@ -239,14 +240,12 @@ class SolanaWalletManager:
         Returns:
             List of active session IDs
         """
-        active_sessions = []
-
-        for session_id, session_data in self.sessions.items():
-            if (session_data['wallet_address'] == wallet_address and
-                    datetime.utcnow() <= session_data['expires_at']):
-                active_sessions.append(session_id)
+        now = datetime.utcnow()
 
-        return active_sessions
+        return [
+            session_id for session_id, session_data in self.sessions.items()
+            if session_data['wallet_address'] == wallet_address and now <= session_data['expires_at']
+        ]
 
     def cleanup_expired(self):
         """Remove expired challenges and sessions"""
@@ -1,7 +1,10 @@
 """
 Tests for API client integration
 """
+import asyncio
 import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 from datetime import datetime
 from api_client_integration import (
     PredictionMarketAggregator,
@@ -100,6 +103,23 @@ class TestPredictionMarketAggregator:
             for i in range(len(markets) - 1):
                 assert markets[i].volume_24h >= markets[i + 1].volume_24h
 
+    @pytest.mark.asyncio
+    async def test_aggregator_top_k_markets(self, mock_aggregator):
+        """Test top_k returns the highest-volume markets in order"""
+        all_markets = await mock_aggregator.get_all_markets(limit_per_platform=10)
+        top = await mock_aggregator.get_all_markets(limit_per_platform=10, top_k=3)
+
+        assert [m.volume_24h for m in top] == [m.volume_24h for m in all_markets[:3]]
+
+    @pytest.mark.asyncio
+    async def test_aggregator_get_market_details(self, mock_aggregator):
+        """Test market details are found on the owning platform"""
+        market = await mock_aggregator.get_market_details("kalshi_btc_100k")
+        assert market is not None
+        assert market.platform == "kalshi"
+
+        assert await mock_aggregator.get_market_details("no_such_market") is None
+
     @pytest.mark.asyncio
     async def test_aggregator_compare_markets(self, mock_aggregator):
         """Test comparing markets across platforms"""
@@ -110,6 +130,83 @@ class TestPredictionMarketAggregator:
         # At least some platforms should have results
         assert len(results) > 0
 
+    @pytest.mark.asyncio
+    async def test_aggregator_reuses_cached_market_lists(self, mock_aggregator):
+        """Test repeated fetches within the TTL do not hit the clients again"""
+        calls = []
+        client = mock_aggregator.clients["polymarket"]
+        original_get_markets = client.get_markets
+
+        async def counting_get_markets(*args, **kwargs):
+            calls.append(args)
+            return await original_get_markets(*args, **kwargs)
+
+        client.get_markets = counting_get_markets
+
+        await mock_aggregator.compare_market("Will Bitcoin reach $100,000?")
+        await mock_aggregator.compare_market("Will Ethereum reach $5,000?")
+
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_aggregator_coalesces_concurrent_fetches(self, mock_aggregator):
+        """Test concurrent fetches for the same key share one upstream request"""
+        calls = []
+        client = mock_aggregator.clients["polymarket"]
+        original_get_markets = client.get_markets
+
+        async def slow_get_markets(*args, **kwargs):
+            calls.append(args)
+            await asyncio.sleep(0.01)
+            return await original_get_markets(*args, **kwargs)
+
+        client.get_markets = slow_get_markets
+
+        await asyncio.gather(
+            mock_aggregator.get_all_markets(limit_per_platform=100),
+            mock_aggregator.compare_market("Will Bitcoin reach $100,000?"),
+        )
+
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_aggregator_cancelled_caller_does_not_cancel_shared_fetch(self, mock_aggregator):
+        """Test cancelling one caller leaves other callers of the same fetch unaffected"""
+        client = mock_aggregator.clients["polymarket"]
+        original_get_markets = client.get_markets
+
+        async def slow_get_markets(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return await original_get_markets(*args, **kwargs)
+
+        client.get_markets = slow_get_markets
+
+        compare = asyncio.create_task(mock_aggregator.compare_market("Will Bitcoin reach $100,000?"))
+        await asyncio.sleep(0)
+        markets = asyncio.create_task(mock_aggregator.get_all_markets(limit_per_platform=100))
+        await asyncio.sleep(0.01)
+        compare.cancel()
+
+        assert any(m.platform == "polymarket" for m in await markets)
+
+
+    @pytest.mark.asyncio
+    async def test_aggregator_skips_slow_platforms(self, mock_aggregator):
+        """Test a platform that misses the timeout does not hold up the others"""
+        client = mock_aggregator.clients["kalshi"]
+
+        async def hanging_get_markets(*args, **kwargs):
+            await asyncio.sleep(10)
+            return []
+
+        client.get_markets = hanging_get_markets
+        mock_aggregator._platform_timeout = 0.05
+
+        markets = await mock_aggregator.get_all_markets(limit_per_platform=5)
+
+        assert markets
+        assert all(m.platform != "kalshi" for m in markets)
+
 
 class TestAPIConfig:
     """Test APIConfig data class"""
@@ -167,3 +264,109 @@ class TestMarketData:
         assert market.market_type == "binary"
         assert market.volume_24h == 0.0
         assert market.status == "open"
+
+    def test_market_data_question_tokens(self, sample_market_data):
+        """Test question tokens are lower-cased and cached on the instance"""
+        tokens = sample_market_data.question_tokens
+
+        assert tokens == frozenset({"will", "this", "test", "pass?"})
+        assert sample_market_data.question_tokens is tokens
+
+    def test_market_data_from_manifold(self):
+        """Test the Manifold fast constructor matches the regular constructor"""
+        now = datetime.utcnow()
+        market = MarketData.from_manifold({
+            "id": "abc",
+            "question": "Will it rain?",
+            "outcomeType": "BINARY",
+            "probability": 0.4,
+            "groupSlugs": ["weather"],
+            "creatorUsername": "alice",
+            "slug": "will-it-rain",
+        }, now)
+
+        assert market == MarketData(
+            id="abc",
+            platform="manifold",
+            question="Will it rain?",
+            category="weather",
+            market_type="BINARY",
+            outcomes=("Yes", "No"),
+            current_price=0.4,
+            probability=0.4,
+            volume_24h=0,
+            total_volume=0,
+            liquidity=0,
+            url="https://manifold.markets/alice/will-it-rain",
+            last_updated=now
+        )
+
+
+@pytest.fixture
+async def rate_limited_server():
+    """Serve /markets, answering the first request with a 429"""
+    requests = []
+
+    async def markets(request):
+        requests.append(request.path)
+        if len(requests) == 1:
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        return web.json_response({"markets": []})
+
+    app = web.Application()
+    app.router.add_get("/markets", markets)
+    server = TestServer(app)
+    await server.start_server()
+    yield server, requests
+    await server.close()
+
+
+class TestRealClientRequests:
+    """Test rate limiting and retries in the real platform clients"""
+
+    @pytest.mark.asyncio
+    async def test_429_retry_takes_a_limiter_slot(self, rate_limited_server):
+        """Test a 429 re-attempt acquires the limiter again and releases the concurrency slot"""
+        real = pytest.importorskip("api_clients_real")  # Needs polyrouter_client on the path
+        server, requests = rate_limited_server
+        client = real.PolymarketRealClient(real.APIConfig(api_key="", base_url=str(server.make_url("")), rate_limit=2))
+        acquired = []
+        original_acquire = client.rate_limit_bucket.acquire
+
+        async def counting_acquire(*args):
+            acquired.append(client._concurrency._value)
+            await original_acquire(*args)
+
+        client.rate_limit_bucket.acquire = counting_acquire
+
+        async with client:
+            assert await client._rate_limited_request("GET", "/markets") == {"markets": []}
+        await real.close_shared_session()
+
+        assert len(requests) == 2
+        assert acquired == [2, 2]  # No concurrency slot held across the 429 back-off
+
+    @pytest.mark.asyncio
+    async def test_aggregator_bounds_market_id_fan_out(self):
+        """Test per-market lookups share the aggregator's concurrency cap"""
+        real = pytest.importorskip("api_clients_real")  # Needs polyrouter_client on the path
+        aggregator = real.RealPredictionMarketAggregator({}, max_concurrency=3)
+        client = aggregator.clients["polymarket"] = real.PolymarketRealClient(real.APIConfig(api_key=""))
+        running = []
+        peak = 0
+
+        async def get_market(market_id):
+            nonlocal peak
+            running.append(market_id)
+            peak = max(peak, len(running))
+            await asyncio.sleep(0.01)
+            running.remove(market_id)
+            return {"id": market_id}
+
+        client.get_market = get_market
+
+        markets = await aggregator.get_markets_by_ids("polymarket", [str(i) for i in range(20)])
+        await real.close_shared_session()
+
+        assert len(markets) == 20
+        assert peak == 3
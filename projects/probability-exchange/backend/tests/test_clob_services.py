@@ -0,0 +1,140 @@
+"""
+Tests for the Kalshi and Polymarket CLOB services
+"""
+import sys
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.services import kalshi_clob_service, polymarket_clob_service
+
+
+@pytest.fixture(params=[kalshi_clob_service.KalshiCLOBService, polymarket_clob_service.PolymarketCLOBService])
+def service(request):
+    """Each CLOB service, with no session"""
+    return request.param()
+
+
+class TestMarketsCache:
+    """Test the per-argument market list cache"""
+
+    @pytest.mark.asyncio
+    async def test_markets_cache_is_bounded(self, service, monkeypatch):
+        """Test distinct categories evict the oldest cached market lists"""
+        monkeypatch.setattr(sys.modules[type(service).__module__], "MARKETS_CACHE_SIZE", 4)
+
+        async def fetch_markets(limit, active_only, category):
+            return [{"category": category}]
+
+        service._fetch_markets = fetch_markets
+
+        for i in range(6):
+            assert await service.fetch_markets(10, True, f"category-{i}") == [{"category": f"category-{i}"}]
+
+        assert [key[2] for key in service._markets_cache] == ["category-2", "category-3", "category-4", "category-5"]
+
+
+@pytest.fixture
+async def clob_server():
+    """Serve a flaky endpoint (`/a`) and a healthy one (`/b`); `failures` 5xx responses are sent before any 200"""
+    state = {"failures": 0, "hits": [], "conditional": []}
+
+    async def markets(request):
+        state["hits"].append(request.path)
+        state["conditional"].append(request.headers.get("If-None-Match"))
+        if request.path.startswith("/a") or state["failures"]:
+            state["failures"] = max(0, state["failures"] - 1)
+            return web.Response(status=503)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.json_response({"markets": [{"ticker": "T1"}], "cursor": ""}, headers={"ETag": '"v1"'})
+
+    app = web.Application()
+    app.router.add_get("/a/markets", markets)
+    app.router.add_get("/b/markets", markets)
+    server = TestServer(app)
+    await server.start_server()
+    yield server, state
+    await server.close()
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    """Retry immediately"""
+    for module in (kalshi_clob_service, polymarket_clob_service):
+        monkeypatch.setattr(module, "RETRY_BASE_DELAY", 0)
+
+
+class TestConditionalRequests:
+    """Test retries and ETag revalidation in the shared request path"""
+
+    @pytest.mark.asyncio
+    async def test_5xx_is_retried(self, service, clob_server, no_backoff):
+        """Test transient 5xx responses are retried until a 200"""
+        server, state = clob_server
+        state["failures"] = 2
+
+        async with service:
+            status, data = await service._get_json(str(server.make_url("/b/markets")), aiohttp.ClientTimeout(total=5))
+
+        assert status == 200
+        assert data["markets"] == [{"ticker": "T1"}]
+        assert len(state["hits"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_304_replays_cached_body(self, service, clob_server):
+        """Test a second GET revalidates with the ETag and replays the cached body on 304"""
+        server, state = clob_server
+        url = str(server.make_url("/b/markets"))
+
+        async with service:
+            first = await service._get_json(url, aiohttp.ClientTimeout(total=5))
+            second = await service._get_json(url, aiohttp.ClientTimeout(total=5))
+
+        assert second == first == (200, {"markets": [{"ticker": "T1"}], "cursor": ""})
+        assert state["conditional"] == [None, '"v1"']
+
+
+class TestKalshiFailover:
+    """Test moving off a failing Kalshi endpoint"""
+
+    @pytest.mark.asyncio
+    async def test_failing_endpoint_fails_over(self, clob_server, no_backoff, monkeypatch):
+        """Test a request that keeps failing is re-sent to the next working endpoint"""
+        server, _ = clob_server
+        flaky, healthy = str(server.make_url("/a")), str(server.make_url("/b"))
+        monkeypatch.setattr(kalshi_clob_service, "KALSHI_ENDPOINTS", [flaky, healthy])
+
+        async with kalshi_clob_service.KalshiCLOBService() as service:
+            service.working_endpoint = flaky
+            status, data = await service._get_with_failover(flaky, "/markets", aiohttp.ClientTimeout(total=5))
+
+        assert status == 200
+        assert data["markets"] == [{"ticker": "T1"}]
+        assert service.working_endpoint == healthy
+
+
+class TestAggregateService:
+    """Test the shared aggregate over both CLOB services"""
+
+    @pytest.mark.asyncio
+    async def test_aggregate_is_rebuilt_after_shutdown(self):
+        """Test a restart gets an aggregate over the new CLOB services, not the closed ones"""
+        from app.services import clob_aggregate_service
+
+        first = await clob_aggregate_service.get_aggregate_service()
+        await clob_aggregate_service.close_aggregate_service()
+        await kalshi_clob_service.close_kalshi_service()
+        await polymarket_clob_service.close_clob_service()
+
+        second = await clob_aggregate_service.get_aggregate_service()
+        try:
+            assert second is not first
+            assert second.kalshi is await kalshi_clob_service.get_kalshi_service()
+            assert second.kalshi.session is not None and not second.kalshi.session.closed
+        finally:
+            await clob_aggregate_service.close_aggregate_service()
+            await kalshi_clob_service.close_kalshi_service()
+            await polymarket_clob_service.close_clob_service()
@@ -0,0 +1,92 @@
+"""
+Tests for core application utilities
+"""
+import logging
+from datetime import timedelta
+from logging.handlers import QueueHandler
+
+import pytest
+
+from app.core import logger as app_logger
+
+
+class TestLogging:
+    """Test queued logging setup"""
+
+    @pytest.fixture
+    def root_handlers(self):
+        """Restore the root logger's handlers after the test"""
+        root = logging.getLogger()
+        saved = root.handlers[:]
+        yield root
+        app_logger.stop_logging()
+        root.handlers[:] = saved
+
+    def test_setup_logging_replaces_existing_root_handlers(self, root_handlers):
+        """Test setup_logging installs the queue handler even if basicConfig already ran"""
+        logging.basicConfig(level=logging.INFO)
+        root_handlers.addHandler(logging.StreamHandler())
+
+        app_logger.setup_logging()
+
+        assert len(root_handlers.handlers) == 1
+        assert isinstance(root_handlers.handlers[0], QueueHandler)
+
+    def test_stop_logging_restores_direct_output(self, root_handlers):
+        """Test stop_logging leaves no orphaned queue handler and setup_logging can start again"""
+        app_logger.setup_logging()
+        app_logger.stop_logging()
+
+        assert not any(isinstance(h, QueueHandler) for h in root_handlers.handlers)
+
+        app_logger.setup_logging()
+
+        assert isinstance(root_handlers.handlers[0], QueueHandler)
+        assert app_logger._listener is not None
+
+
+class TestSecurity:
+    """Test JWT access tokens"""
+
+    @pytest.fixture
+    def security(self):
+        """The security module, with an empty token cache"""
+        jwt = pytest.importorskip("jwt")
+        from app.core import security
+        security._decode_token.cache_clear()
+        yield security, jwt
+        security._decode_token.cache_clear()
+
+    def test_token_round_trip(self, security):
+        """Test a created token verifies to its claims"""
+        security, _ = security
+        token = security.create_access_token({"sub": "alice"})
+
+        payload = security.verify_token(token)
+
+        assert payload["sub"] == "alice"
+        assert "exp" in payload
+
+    def test_verified_payload_is_a_copy(self, security):
+        """Test mutating a verified payload does not affect later verifications"""
+        security, _ = security
+        token = security.create_access_token({"sub": "alice"})
+
+        security.verify_token(token)["sub"] = "mallory"
+
+        assert security.verify_token(token)["sub"] == "alice"
+
+    def test_expired_token_is_rejected(self, security):
+        """Test an expired token does not verify"""
+        security, _ = security
+        token = security.create_access_token({"sub": "alice"}, expires_delta=timedelta(seconds=-1))
+
+        assert security.verify_token(token) is None
+
+    def test_wrong_secret_is_rejected_and_not_cached(self, security):
+        """Test a token signed with another secret does not verify and takes no cache slot"""
+        security, jwt = security
+        token = jwt.encode({"sub": "alice"}, "not-the-secret", algorithm=security.settings.jwt_algorithm)
+
+        assert security.verify_token(token) is None
+        assert security._decode_token.cache_info().currsize == 0
@@ -0,0 +1,102 @@
+"""
+Tests for the DFlow API client
+"""
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from dflow_client import DFlowAPIClient, DFlowConfig
+
+
+@pytest.fixture
+async def dflow_server():
+    """Serve DFlow-like endpoints; queue Retry-After values in `rate_limits` to answer the next requests with 429s"""
+    hits = []
+    rate_limits = []
+
+    async def tokens(request):
+        hits.append(request.path)
+        if rate_limits:
+            return web.Response(status=429, headers={"Retry-After": str(rate_limits.pop(0))})
+        await asyncio.sleep(0.01)
+        return web.json_response({"tokens": [{"mint": "usdc"}]})
+
+    app = web.Application()
+    app.router.add_get("/api/tokens-with-decimals", tokens)
+    server = TestServer(app)
+    await server.start_server()
+    yield server, hits, rate_limits
+    await server.close()
+
+
+def _client(server, **kwargs) -> DFlowAPIClient:
+    """Build a client against the test server"""
+    return DFlowAPIClient(DFlowConfig(base_url=str(server.make_url("/api")), **kwargs))
+
+
+class TestDFlowResponseCache:
+    """Test the cached GET path"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_request(self, dflow_server):
+        """Test concurrent cache misses are served by a single upstream request"""
+        server, hits, _ = dflow_server
+
+        async with _client(server) as client:
+            results = await asyncio.gather(*(client.get_available_tokens() for _ in range(5)))
+            assert await client.get_available_tokens() == [{"mint": "usdc"}]
+
+        assert all(r == [{"mint": "usdc"}] for r in results)
+        assert len(hits) == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_response_is_not_cached(self, dflow_server):
+        """Test exhausting retries on 429 raises instead of caching an empty result"""
+        server, hits, rate_limits = dflow_server
+        rate_limits.extend([0, 0])
+
+        async with _client(server, retry_attempts=2) as client:
+            assert await client.get_available_tokens() == []
+            assert await client.get_available_tokens() == [{"mint": "usdc"}]
+
+        assert len(hits) == 3
+
+
+class TestDFlowSession:
+    """Test session ownership"""
+
+    @pytest.mark.asyncio
+    async def test_client_can_be_entered_again(self, dflow_server):
+        """Test re-entering a client after exit opens a new session"""
+        server, hits, _ = dflow_server
+        client = _client(server)
+
+        for _ in range(2):
+            async with client:
+                client._response_cache.clear()
+                assert await client.get_available_tokens() == [{"mint": "usdc"}]
+
+        assert client.session is None
+        assert len(hits) == 2
+
+
+class TestDFlowRateLimit:
+    """Test the shared request rate limiter"""
+
+    @pytest.mark.asyncio
+    async def test_429_blocks_the_limiter_for_retry_after(self, dflow_server):
+        """Test a 429 with Retry-After: n holds every caller's next acquire for about n seconds"""
+        server, _, rate_limits = dflow_server
+        rate_limits.append(1)
+
+        async with _client(server, rate_limit=6000, retry_attempts=1) as client:
+            assert await client.get_available_tokens() == []
+
+            started = time.monotonic()
+            await client.rate_limit_bucket.acquire()
+            waited = time.monotonic() - started
+
+        assert 0.9 <= waited < 1.5